@@ -19,6 +19,7 @@ from alembic import context
 from app.config import settings
 from app.database import Base
 import app.models  # noqa: F401 — ensures all models are registered
+from app.models.emissions import ACTIVITY_PARTITION_PREFIX
 
 config = context.config
 
@@ -30,11 +31,20 @@ config.set_main_option("sqlalchemy.url", settings.database_url)
 target_metadata = Base.metadata
 
 
+def include_name(name, type_, parent_names) -> bool:
+    # Monthly activity_records partitions are created by a database function,
+    # not declared as models; keep autogenerate from dropping them.
+    if type_ == "table" and name and name.startswith(ACTIVITY_PARTITION_PREFIX):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -43,7 +53,9 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection):
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_name=include_name
+    )
     with context.begin_transaction():
         context.run_migrations()
 
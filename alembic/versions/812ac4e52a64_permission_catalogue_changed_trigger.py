@@ -0,0 +1,48 @@
+"""permission_catalogue_changed_trigger
+
+Revision ID: 812ac4e52a64
+Revises: f354fe383cbc
+Create Date: 2026-10-14 23:52:43.758081
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '812ac4e52a64'
+down_revision: Union[str, Sequence[str], None] = 'f354fe383cbc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Running workers keep the whole catalogue in memory; one notification
+    # per statement is enough to make them reload it.  The function takes
+    # the channel as its trigger argument, so every table cached this way
+    # shares it.
+    op.execute(
+        """
+        CREATE FUNCTION notify_table_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(TG_ARGV[0], '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER permissions_catalogue_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON permissions
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_table_changed('permission_catalogue_changed')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS permissions_catalogue_changed ON permissions")
+    op.execute("DROP FUNCTION IF EXISTS notify_table_changed()")
@@ -0,0 +1,47 @@
+"""principal_changed_trigger
+
+Revision ID: f1785bf55529
+Revises: 258d3e2d3fb8
+Create Date: 2026-10-14 23:45:36.111922
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1785bf55529'
+down_revision: Union[str, Sequence[str], None] = '258d3e2d3fb8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Running workers cache (cognito_sub -> company, flags); tell them when a
+    # user row changes.  Inserts are skipped: unknown subs are never cached.
+    op.execute(
+        """
+        CREATE FUNCTION notify_principal_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('principal_changed', OLD.cognito_sub);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_principal_changed
+        AFTER UPDATE OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_principal_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_principal_changed ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_principal_changed()")
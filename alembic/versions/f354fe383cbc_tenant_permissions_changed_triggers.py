@@ -0,0 +1,63 @@
+"""tenant_permissions_changed_triggers
+
+Revision ID: f354fe383cbc
+Revises: f1785bf55529
+Create Date: 2026-10-14 23:50:45.638126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f354fe383cbc'
+down_revision: Union[str, Sequence[str], None] = 'f1785bf55529'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Running workers cache each user's effective permissions per company;
+    # tell them which company's role assignments changed.  role_permissions
+    # has no company_id, so it is looked up through the role; if the role is
+    # already gone the payload is empty and listeners flush everything.
+    op.execute(
+        """
+        CREATE FUNCTION notify_tenant_permissions_changed() RETURNS trigger AS $$
+        DECLARE
+            row_data record;
+            target_company uuid;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_data := OLD;
+            ELSE
+                row_data := NEW;
+            END IF;
+            IF TG_TABLE_NAME = 'role_permissions' THEN
+                SELECT company_id INTO target_company FROM roles WHERE id = row_data.role_id;
+            ELSE
+                target_company := row_data.company_id;
+            END IF;
+            PERFORM pg_notify('tenant_permissions_changed', COALESCE(target_company::text, ''));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in ("roles", "role_permissions", "user_roles"):
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_tenant_permissions_changed
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_tenant_permissions_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("user_roles", "role_permissions", "roles"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_tenant_permissions_changed ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_tenant_permissions_changed()")
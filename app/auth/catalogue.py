@@ -0,0 +1,101 @@
+"""In-memory copy of the global ``Permission`` catalogue.
+
+The catalogue is small and rarely changes, so each worker loads it once at
+startup into an immutable ``PermissionCatalogue``: permission names are
+interned and every permission gets a fixed bit index (by name order) used
+by the per-user bitsets in ``app.auth.permissions``.  Request-path lookups
+by name are a dict access and never touch the database.
+
+A statement-level trigger on ``permissions`` sends
+``permission_catalogue_changed``; every worker then reloads the catalogue
+in the background and swaps it in atomically.  Bit indexes may shift on
+reload, so listeners registered with ``on_reload`` (the permission
+resolver) drop anything derived from the previous catalogue.
+"""
+
+import sys
+import uuid
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models.tenant import Permission
+from app.notifications import ReloadingStore
+
+PERMISSION_CATALOGUE_CHANNEL = "permission_catalogue_changed"
+
+
+@dataclass(frozen=True, slots=True)
+class PermissionCatalogue:
+    """Immutable name <-> id <-> bit index mapping."""
+
+    version: int
+    # Indexed by bit.
+    names: tuple[str, ...]
+    ids: tuple[uuid.UUID, ...]
+    bit_by_name: Mapping[str, int]
+    bit_by_id: Mapping[uuid.UUID, int]
+
+    @classmethod
+    def from_rows(
+        cls, rows: list[tuple[uuid.UUID, str]], version: int = 0
+    ) -> "PermissionCatalogue":
+        ordered = sorted(rows, key=lambda row: row[1])
+        names = tuple(sys.intern(name) for _, name in ordered)
+        ids = tuple(pid for pid, _ in ordered)
+        return cls(
+            version=version,
+            names=names,
+            ids=ids,
+            bit_by_name=MappingProxyType({name: bit for bit, name in enumerate(names)}),
+            bit_by_id=MappingProxyType({pid: bit for bit, pid in enumerate(ids)}),
+        )
+
+    def mask(self, permission_ids) -> int:
+        mask = 0
+        for pid in permission_ids:
+            bit = self.bit_by_id.get(pid)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+
+class CatalogueStore(ReloadingStore):
+    description = "permission catalogue"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.catalogue: PermissionCatalogue | None = None
+        self._version = 0
+        self._reload_listeners: list[Callable[[], None]] = []
+
+    def on_reload(self, listener: Callable[[], None]) -> None:
+        self._reload_listeners.append(listener)
+
+    async def load(self, db: AsyncSession | None = None) -> PermissionCatalogue:
+        if db is None:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(select(Permission.id, Permission.name))
+        else:
+            result = await db.execute(select(Permission.id, Permission.name))
+        self._version += 1
+        catalogue = PermissionCatalogue.from_rows(
+            [tuple(row) for row in result], version=self._version
+        )
+        self.catalogue = catalogue
+        for listener in self._reload_listeners:
+            listener()
+        return catalogue
+
+    async def get(self, db: AsyncSession) -> PermissionCatalogue:
+        """The loaded catalogue; loads it with ``db`` if startup could not."""
+        if self.catalogue is None:
+            return await self.load(db)
+        return self.catalogue
+
+
+catalogue_store = CatalogueStore()
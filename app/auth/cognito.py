@@ -1,51 +1,64 @@
-import urllib.request
-import json
-from functools import lru_cache
-from typing import Annotated, cast
+import time
+from typing import Annotated
 
 import jwt
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
-from jwt.algorithms import RSAAlgorithm
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from app.config import settings
+from app.auth.jwks import jwks_store
+from app.auth.token_cache import is_revoked, token_cache
+from app.metrics import registry
 
 bearer_scheme = HTTPBearer()
 
+verify_duration_seconds = registry.histogram(
+    "auth_verify_duration_seconds", "Bearer token verification time, cache hits included."
+)
 
-@lru_cache(maxsize=1)
-def _get_jwks() -> dict:
-    with urllib.request.urlopen(settings.cognito_jwks_url) as response:
-        return json.loads(response.read())
 
-
-def _get_public_key(token: str) -> RSAPublicKey:
+async def _get_public_key(token: str) -> RSAPublicKey:
     header = jwt.get_unverified_header(token)
-    jwks = _get_jwks()
-    for key in jwks["keys"]:
-        if key["kid"] == header["kid"]:
-            return cast(RSAPublicKey, RSAAlgorithm.from_jwk(json.dumps(key)))
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Public key not found")
+    kid = header.get("kid")
+    key = await jwks_store.get_key(kid) if kid else None
+    if key is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Public key not found")
+    return key
 
 
-def verify_token(
+async def verify_token(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
 ) -> dict:
-    token = credentials.credentials
+    start = time.perf_counter()
     try:
-        public_key = _get_public_key(token)
-        payload = jwt.decode(
-            token,
-            public_key,
-            algorithms=["RS256"],
-            options={"verify_aud": False},
-        )
-        return payload
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
-    except jwt.InvalidTokenError as e:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+        return await _verify(credentials.credentials)
+    finally:
+        verify_duration_seconds.observe(time.perf_counter() - start)
+
+
+async def _verify(token: str) -> dict:
+    payload = token_cache.get(token) if token_cache is not None else None
+    if payload is None:
+        try:
+            public_key = await _get_public_key(token)
+            payload = jwt.decode(
+                token,
+                public_key,
+                algorithms=["RS256"],
+                options={"verify_aud": False},
+            )
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+        except jwt.InvalidTokenError as e:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+        if token_cache is not None:
+            token_cache.put(token, payload)
+
+    if is_revoked(payload):
+        if token_cache is not None:
+            token_cache.discard(token)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    return dict(payload)
 
 
 CurrentUser = Annotated[dict, Depends(verify_token)]
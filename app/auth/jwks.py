@@ -0,0 +1,155 @@
+"""Process-local store for the Cognito JSON Web Key Set.
+
+Keys are loaded at startup, refreshed in the background every
+``jwks_ttl_seconds`` and refetched on demand when a token carries a ``kid``
+we have not seen yet (e.g. right after Cognito rotates its signing keys).
+On-demand refetches are rate limited so a stream of tokens with bogus kids
+cannot stampede the JWKS endpoint.
+
+Each refresh parses the key set once into ready-to-use ``RSAPublicKey``
+objects indexed by ``kid``, so verifying a token costs one dict lookup and
+no key construction.
+
+The HTTP fetch runs in a worker thread, so the event loop is never blocked.
+Pass a custom ``fetcher`` coroutine to serve keys from a local stand-in.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import urllib.request
+from typing import Awaitable, Callable, cast
+
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+from jwt import exceptions as jwt_exceptions
+from jwt.algorithms import RSAAlgorithm
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+JWKSFetcher = Callable[[], Awaitable[dict]]
+
+
+class JWKSStore:
+    def __init__(
+        self,
+        url: str,
+        *,
+        ttl: float,
+        min_refetch_interval: float,
+        fetch_timeout: float,
+        fetcher: JWKSFetcher | None = None,
+    ) -> None:
+        self.url = url
+        self.ttl = ttl
+        self.min_refetch_interval = min_refetch_interval
+        self.fetch_timeout = fetch_timeout
+        self._fetcher = fetcher or self._fetch_http
+        self._keys: dict[str, RSAPublicKey] = {}
+        self._fetched_at: float | None = None
+        self._last_attempt = float("-inf")
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._fetched_at is not None
+
+    @property
+    def age_seconds(self) -> float | None:
+        """Seconds since the last successful fetch, or None if never loaded."""
+        if self._fetched_at is None:
+            return None
+        return time.monotonic() - self._fetched_at
+
+    async def _fetch_http(self) -> dict:
+        return await asyncio.to_thread(self._fetch_blocking)
+
+    def _fetch_blocking(self) -> dict:
+        with urllib.request.urlopen(self.url, timeout=self.fetch_timeout) as response:
+            return json.loads(response.read())
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            await self._refresh_locked()
+
+    async def _refresh_locked(self) -> None:
+        self._last_attempt = time.monotonic()
+        jwks = await self._fetcher()
+        self._keys = _parse_keys(jwks)
+        self._fetched_at = time.monotonic()
+
+    async def get_key(self, kid: str) -> RSAPublicKey | None:
+        """Return the public key for ``kid``, refetching once if it is unknown."""
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        async with self._lock:
+            # Another coroutine may have refreshed while we waited for the lock.
+            key = self._keys.get(kid)
+            if key is not None:
+                return key
+            if time.monotonic() - self._last_attempt < self.min_refetch_interval:
+                return None
+            try:
+                await self._refresh_locked()
+            except Exception:
+                logger.exception("JWKS refetch for unknown kid %r failed", kid)
+                return None
+            return self._keys.get(kid)
+
+    async def start(self) -> None:
+        """Load keys and start the background refresh task.
+
+        A failed initial load is logged rather than raised; the background
+        task and on-demand refetches keep retrying.
+        """
+        try:
+            await self.refresh()
+        except Exception:
+            logger.exception("Initial JWKS load from %s failed", self.url)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="jwks-refresh")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            # Until the first successful load, retry at the refetch interval.
+            delay = self.ttl if self.loaded else self.min_refetch_interval
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Background JWKS refresh from %s failed", self.url)
+
+
+def _parse_keys(jwks: dict) -> dict[str, RSAPublicKey]:
+    keys: dict[str, RSAPublicKey] = {}
+    for jwk in jwks["keys"]:
+        if jwk.get("kty") != "RSA":
+            continue
+        try:
+            keys[jwk["kid"]] = cast(RSAPublicKey, RSAAlgorithm.from_jwk(jwk))
+        except (KeyError, ValueError, jwt_exceptions.InvalidKeyError):
+            logger.warning("Skipping malformed JWK %r", jwk.get("kid"))
+    return keys
+
+
+jwks_store = JWKSStore(
+    settings.cognito_jwks_url,
+    ttl=settings.jwks_ttl_seconds,
+    min_refetch_interval=settings.jwks_min_refetch_interval_seconds,
+    fetch_timeout=settings.jwks_fetch_timeout_seconds,
+)
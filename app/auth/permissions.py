@@ -0,0 +1,129 @@
+"""Effective-permission resolution with per-user bitsets.
+
+A user's permissions are the union of the permissions granted by the roles
+assigned to them within their company.  ``PermissionResolver`` computes
+that set with one query, stores it as an int bitset over the global
+``Permission`` catalogue (bit i = i-th permission), and caches it per
+(company, user).  A permission check on a warm cache is a dict lookup and
+a bit test, with no database access.
+
+Triggers on ``roles``, ``role_permissions`` and ``user_roles`` send a
+``tenant_permissions_changed`` notification carrying the company id; every
+worker then drops that company's cached sets.  Reloading the catalogue
+(see ``app.auth.catalogue``) drops every cached set, as bit indexes may
+have moved.
+"""
+
+import logging
+import time
+import uuid
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.catalogue import CatalogueStore, PermissionCatalogue, catalogue_store
+from app.config import settings
+from app.models.tenant import Role, RolePermission, UserRole
+
+logger = logging.getLogger(__name__)
+
+TENANT_PERMISSIONS_CHANNEL = "tenant_permissions_changed"
+
+
+class PermissionResolver:
+    def __init__(self, catalogues: CatalogueStore, ttl: float, max_size: int) -> None:
+        self.catalogues = catalogues
+        self.ttl = ttl
+        self.max_size = max_size
+        # (company_id, user_id) -> (bitset, expires_at, generation, catalogue version)
+        self._entries: dict[
+            tuple[uuid.UUID, uuid.UUID], tuple[int, float, tuple[int, int], int]
+        ] = {}
+        # Bumped per company by invalidate_company() and for every company
+        # by clear().
+        self._generations: dict[uuid.UUID, int] = {}
+        self._epoch = 0
+        catalogues.on_reload(self.clear)
+
+    async def _mask(
+        self,
+        db: AsyncSession,
+        catalogue: PermissionCatalogue,
+        company_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> int:
+        key = (company_id, user_id)
+        generation = self._generation(company_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            mask, expires_at, entry_generation, version = entry
+            if (
+                expires_at > time.monotonic()
+                and entry_generation == generation
+                and version == catalogue.version
+            ):
+                return mask
+
+        result = await db.execute(
+            select(RolePermission.permission_id)
+            .join(UserRole, UserRole.role_id == RolePermission.role_id)
+            .join(Role, and_(Role.id == UserRole.role_id, Role.company_id == UserRole.company_id))
+            .where(UserRole.user_id == user_id, UserRole.company_id == company_id)
+            .distinct()
+        )
+        mask = catalogue.mask(result.scalars())
+
+        self._entries.pop(key, None)
+        while len(self._entries) >= self.max_size:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (mask, time.monotonic() + self.ttl, generation, catalogue.version)
+        return mask
+
+    async def has_permission(
+        self,
+        db: AsyncSession,
+        company_id: uuid.UUID,
+        user_id: uuid.UUID,
+        permission: str,
+    ) -> bool:
+        """Whether the user's roles grant ``permission``.
+
+        ``db`` must be a tenant session (RLS active for ``company_id``).
+        """
+        catalogue = await self.catalogues.get(db)
+        bit = catalogue.bit_by_name.get(permission)
+        if bit is None:
+            logger.warning("Permission check for unknown permission %r", permission)
+            return False
+        return bool(await self._mask(db, catalogue, company_id, user_id) >> bit & 1)
+
+    def _generation(self, company_id: uuid.UUID) -> tuple[int, int]:
+        return self._epoch, self._generations.get(company_id, 0)
+
+    def invalidate_company(self, company_id: uuid.UUID) -> None:
+        # Entries tagged with an older generation are treated as stale.
+        self._generations[company_id] = self._generations.get(company_id, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        # A new epoch outdates every generation, so a lookup in flight cannot
+        # store a stale set.
+        self._generations.clear()
+        self._epoch += 1
+
+    def handle_notification(self, payload: str | None) -> None:
+        try:
+            company_id = uuid.UUID(payload) if payload else None
+        except ValueError:
+            company_id = None
+        if company_id is None:
+            self.clear()
+        else:
+            self.invalidate_company(company_id)
+
+
+permission_resolver = PermissionResolver(
+    catalogue_store,
+    ttl=settings.permission_cache_ttl_seconds,
+    max_size=settings.permission_cache_max_size,
+)
@@ -0,0 +1,89 @@
+"""Process-local cache of authenticated principals.
+
+Every tenant request needs the caller's ``company_id`` and flags, looked up
+by Cognito sub.  Those rarely change, so they are cached as compact, slotted
+``Principal`` records for ``principal_cache_ttl_seconds``.
+
+A trigger on ``users`` sends a ``principal_changed`` notification carrying
+the sub whenever a row is updated or deleted, whoever makes the change
+(``scripts/seed_superadmin.py``, an admin endpoint, a manual fix in psql);
+every worker drops its cached entry when the notification arrives.  Unknown
+subs are never cached, so a freshly provisioned user can sign in
+immediately and inserts need no notification.
+
+An invalidation can arrive while a lookup is between its query and
+``put``.  Callers therefore take ``generation(sub)`` before querying and
+hand it to ``put``, which drops the result if the sub was invalidated (or
+the cache cleared) in the meantime.
+"""
+
+import time
+import uuid
+from dataclasses import dataclass
+
+from app.config import settings
+
+PRINCIPAL_CHANNEL = "principal_changed"
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    user_id: uuid.UUID
+    company_id: uuid.UUID
+    is_active: bool
+    is_superadmin: bool
+
+
+class PrincipalCache:
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: dict[str, tuple[Principal, float]] = {}
+        # Bumped per sub by invalidate() and for every sub by clear().
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+
+    def get(self, cognito_sub: str) -> Principal | None:
+        entry = self._entries.get(cognito_sub)
+        if entry is None:
+            return None
+        principal, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[cognito_sub]
+            return None
+        return principal
+
+    def generation(self, cognito_sub: str) -> tuple[int, int]:
+        return self._epoch, self._generations.get(cognito_sub, 0)
+
+    def put(self, cognito_sub: str, principal: Principal, generation: tuple[int, int]) -> None:
+        if generation != self.generation(cognito_sub):
+            # Invalidated since the caller read the row; it may be stale.
+            return
+        self._entries.pop(cognito_sub, None)
+        while len(self._entries) >= self.max_size:
+            # Dicts keep insertion order, so the first key is the oldest entry.
+            del self._entries[next(iter(self._entries))]
+        self._entries[cognito_sub] = (principal, time.monotonic() + self.ttl)
+
+    def invalidate(self, cognito_sub: str) -> None:
+        self._entries.pop(cognito_sub, None)
+        self._generations[cognito_sub] = self._generations.get(cognito_sub, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        # The new epoch supersedes every per-sub generation.
+        self._generations.clear()
+        self._epoch += 1
+
+    def handle_notification(self, payload: str | None) -> None:
+        if payload:
+            self.invalidate(payload)
+        else:
+            self.clear()
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.principal_cache_ttl_seconds,
+    max_size=settings.principal_cache_max_size,
+)
@@ -0,0 +1,81 @@
+"""Bounded LRU cache of already-verified access tokens.
+
+The SPA sends the same Cognito access token on many requests, and each one
+would otherwise pay for a full RS256 signature check.  Entries are keyed by
+the SHA-256 digest of the raw token (the token itself is never stored) and
+expire at the token's ``exp`` claim, after which the token goes through
+full verification again and fails with the usual "Token expired" error.
+
+Revocation hooks are callables that receive the decoded claims and return
+True when the token must be rejected.  ``verify_token`` consults them on
+every request, cached or not, so a revoked token is refused immediately.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from app.config import settings
+
+RevocationHook = Callable[[dict], bool]
+
+_revocation_hooks: list[RevocationHook] = []
+
+
+def register_revocation_hook(hook: RevocationHook) -> None:
+    _revocation_hooks.append(hook)
+
+
+def is_revoked(claims: dict) -> bool:
+    return any(hook(claims) for hook in _revocation_hooks)
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> dict | None:
+        """Return the cached claims for ``token`` if it has not yet expired."""
+        key = _digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        claims, exp = entry
+        if exp <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            # Without an expiry there is no safe point to evict the entry.
+            return
+        key = _digest(token)
+        self._entries[key] = (claims, float(exp))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        self._entries.pop(_digest(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache: VerifiedTokenCache | None = (
+    VerifiedTokenCache(settings.token_cache_max_size)
+    if settings.token_cache_enabled
+    else None
+)
@@ -1,9 +1,97 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
+from app.db_instrumentation import instrument_engine, record_pool_wait
+from app.metrics import Histogram, registry
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Checkout telemetry collected by ``InstrumentedPool``."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.checkout_latency = Histogram()
+
+    def record(self, elapsed: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += elapsed
+        if elapsed > self.wait_seconds_max:
+            self.wait_seconds_max = elapsed
+        self.checkout_latency.observe(elapsed)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that times every checkout.
+
+    The measured time covers waiting for a free slot, opening a new
+    connection when the pool grows, and the pre-ping.
+    """
+
+    stats = PoolStats()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stats.record(elapsed)
+            record_pool_wait(elapsed)
 
-engine = create_async_engine(settings.database_url, echo=settings.app_env == "development")
+
+engine = create_async_engine(
+    settings.database_url,
+    echo=settings.db_echo,
+    poolclass=InstrumentedPool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout_seconds,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_pre_ping=settings.db_pool_pre_ping,
+)
+
+instrument_engine(engine)
+
+registry.histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time to check a connection out of the pool.",
+    instance=InstrumentedPool.stats.checkout_latency,
+)
+registry.counter(
+    "db_pool_timeouts_total",
+    "Pool checkouts that timed out.",
+    function=lambda: InstrumentedPool.stats.timeouts,
+)
+registry.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out.",
+    function=lambda: engine.pool.checkedout(),
+)
+registry.gauge(
+    "db_pool_overflow",
+    "Connections beyond pool_size (negative while the pool is not yet full).",
+    function=lambda: engine.pool.overflow(),
+)
+registry.gauge(
+    "db_pool_capacity",
+    "pool_size + max_overflow.",
+    function=lambda: settings.db_pool_size + settings.db_max_overflow,
+)
 
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
@@ -15,3 +103,49 @@ class Base(DeclarativeBase):
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def warm_up_pool(connections: int) -> None:
+    """Open pooled connections up front so early requests skip TCP/TLS setup.
+
+    At most ``db_pool_size`` connections are opened, since anything beyond
+    that would be overflow and closed again on check-in.  Failures are logged
+    and leave the pool to fill lazily.
+    """
+    count = min(connections, settings.db_pool_size)
+    if count <= 0:
+        return
+
+    async def _open():
+        conn = await engine.connect()
+        await conn.execute(text("SELECT 1"))
+        return conn
+
+    results = await asyncio.gather(*(_open() for _ in range(count)), return_exceptions=True)
+    opened = [r for r in results if not isinstance(r, BaseException)]
+    for conn in opened:
+        await conn.close()
+    if len(opened) < count:
+        error = next(r for r in results if isinstance(r, BaseException))
+        logger.warning("Pool warm-up opened %d/%d connections: %s", len(opened), count, error)
+
+
+def get_pool_stats() -> dict:
+    """Snapshot of pool occupancy and checkout telemetry for this worker."""
+    pool = engine.pool
+    stats = InstrumentedPool.stats
+    capacity = settings.db_pool_size + settings.db_max_overflow
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "capacity": capacity,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "saturation": checked_out / capacity if capacity else 1.0,
+        "checkouts": stats.checkouts,
+        "timeouts": stats.timeouts,
+        "wait_seconds_total": stats.wait_seconds_total,
+        "wait_seconds_max": stats.wait_seconds_max,
+        "checkout_latency_seconds": stats.checkout_latency.snapshot(),
+    }
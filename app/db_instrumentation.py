@@ -0,0 +1,180 @@
+"""Per-request database instrumentation.
+
+``DBInstrumentationMiddleware`` gives each HTTP request a ``RequestDBStats``
+in a context variable; SQLAlchemy cursor events and the instrumented pool
+add to it.  At the end of the request the totals feed the histograms
+below (exported at ``/metrics``), and outside production they are also
+returned as ``X-DB-*`` response headers, including the slowest statement.
+A request whose slowest statement takes ``slow_statement_seconds`` or
+longer logs that statement.
+
+A statement issued ``n_plus_one_threshold`` or more times in one request
+(same SQL text, any parameters) is flagged as a likely N+1 pattern: it is
+logged, counted, and listed in the ``X-DB-N-Plus-One`` header.  Loops
+that repeat a statement on purpose (one statement per batch of a bulk load)
+mark it with the ``batched=True`` execution option to be left out.
+"""
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_BUCKETS: tuple[float, ...] = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+request_db_seconds = registry.histogram(
+    "db_request_duration_seconds", "Total statement time per HTTP request."
+)
+request_statements = registry.histogram(
+    "db_request_statements", "Statements executed per HTTP request.", buckets=STATEMENT_BUCKETS
+)
+request_slowest_statement_seconds = registry.histogram(
+    "db_request_slowest_statement_seconds", "Slowest statement per HTTP request."
+)
+request_pool_wait_seconds = registry.histogram(
+    "db_request_pool_wait_seconds", "Pool checkout wait per HTTP request."
+)
+n_plus_one_requests = registry.counter(
+    "db_n_plus_one_requests_total", "Requests that repeated a statement like an N+1."
+)
+
+
+@dataclass(slots=True)
+class RequestDBStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+    pool_wait_seconds: float = 0.0
+    statement_counts: Counter = field(default_factory=Counter)
+
+    def record_statement(self, statement: str, elapsed: float, *, batched: bool = False) -> None:
+        self.statements += 1
+        self.db_seconds += elapsed
+        if not batched:
+            self.statement_counts[statement] += 1
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        return [(s, n) for s, n in self.statement_counts.items() if n >= threshold]
+
+
+_current: ContextVar[RequestDBStats | None] = ContextVar("request_db_stats", default=None)
+
+
+def _one_line(statement: str, limit: int = 200) -> str:
+    return " ".join(statement.split())[:limit]
+
+
+def record_pool_wait(elapsed: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait_seconds += elapsed
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement executed through ``engine``."""
+
+    # The start time lives on the execution context, which is discarded with
+    # the statement: after_cursor_execute does not run when a statement
+    # fails, so per-connection state would be left behind.
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._instrumentation_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_instrumentation_start", None)
+        stats = _current.get()
+        if start is None or stats is None:
+            return
+        batched = context.execution_options.get("batched", False)
+        stats.record_statement(statement, time.perf_counter() - start, batched=batched)
+
+
+class DBInstrumentationMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        expose_headers: bool,
+        n_plus_one_threshold: int,
+        slow_statement_seconds: float,
+    ) -> None:
+        self.app = app
+        self.expose_headers = expose_headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_statement_seconds = slow_statement_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self._add_headers(MutableHeaders(scope=message), stats)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if self.expose_headers else send)
+        finally:
+            _current.reset(token)
+            self._finish(scope, stats)
+
+    def _add_headers(self, headers: MutableHeaders, stats: RequestDBStats) -> None:
+        headers["X-DB-Statements"] = str(stats.statements)
+        headers["X-DB-Time-Ms"] = f"{stats.db_seconds * 1000:.2f}"
+        headers["X-DB-Slowest-Ms"] = f"{stats.slowest_seconds * 1000:.2f}"
+        if stats.slowest_statement is not None:
+            # Header values must be latin-1.
+            slowest = _one_line(stats.slowest_statement).encode("latin-1", "replace")
+            headers["X-DB-Slowest-Statement"] = slowest.decode("latin-1")
+        headers["X-DB-Pool-Wait-Ms"] = f"{stats.pool_wait_seconds * 1000:.2f}"
+        repeated = stats.repeated_statements(self.n_plus_one_threshold)
+        if repeated:
+            headers["X-DB-N-Plus-One"] = str(len(repeated))
+
+    def _finish(self, scope: Scope, stats: RequestDBStats) -> None:
+        if stats.statements:
+            request_db_seconds.observe(stats.db_seconds)
+            request_statements.observe(stats.statements)
+            request_slowest_statement_seconds.observe(stats.slowest_seconds)
+            request_pool_wait_seconds.observe(stats.pool_wait_seconds)
+        slowest = stats.slowest_statement
+        if slowest is not None and stats.slowest_seconds >= self.slow_statement_seconds:
+            logger.warning(
+                "Slow statement: %s %s spent %.1f ms on: %s",
+                scope.get("method"),
+                scope.get("path"),
+                stats.slowest_seconds * 1000,
+                _one_line(slowest),
+            )
+        repeated = stats.repeated_statements(self.n_plus_one_threshold)
+        if repeated:
+            n_plus_one_requests.inc()
+            for statement, count in repeated:
+                logger.warning(
+                    "Likely N+1: %s %s ran %d times: %s",
+                    scope.get("method"),
+                    scope.get("path"),
+                    count,
+                    _one_line(statement),
+                )
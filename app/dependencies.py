@@ -1,17 +1,66 @@
 """FastAPI dependencies shared across routers."""
 
-from typing import Annotated, AsyncGenerator
+import sys
+from typing import Annotated, AsyncGenerator, Awaitable, Callable
 
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import text
+from sqlalchemy import String, cast, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
 from sqlalchemy.future import select
 
 from app.auth.cognito import CurrentUser
+from app.auth.permissions import permission_resolver
+from app.auth.principals import Principal, principal_cache
 from app.database import get_db
 from app.models.tenant import User
 
 
+# PostgreSQL setting read by every tenant_isolation RLS policy.
+TENANT_SETTING = "app.current_company_id"
+
+
+def _set_tenant(company_id: ColumnElement | str) -> ColumnElement:
+    # set_config(..., is_local => true) is the function form of SET LOCAL: it
+    # is scoped to the current transaction and cleared when the session is
+    # returned to the pool.
+    return func.set_config(TENANT_SETTING, cast(company_id, String), True)
+
+
+async def _load_principal(
+    cognito_sub: str | None,
+    db: AsyncSession,
+    *,
+    activate_tenant: bool = False,
+) -> Principal | None:
+    """Resolve a Cognito sub to its principal, consulting the cache first.
+
+    With ``activate_tenant`` the RLS company setting is applied as well, in
+    the same round trip: piggybacked on the user lookup on a cache miss, or
+    as a bare ``set_config`` call on a cache hit.
+    """
+    if cognito_sub is None:
+        return None
+    principal = principal_cache.get(cognito_sub)
+    if principal is not None:
+        if activate_tenant:
+            await db.execute(select(_set_tenant(str(principal.company_id))))
+        return principal
+
+    generation = principal_cache.generation(cognito_sub)
+    columns = [User.id, User.company_id, User.is_active, User.is_superadmin]
+    if activate_tenant:
+        # Evaluated only for the matched row, so an unknown sub sets nothing.
+        columns.append(_set_tenant(User.company_id))
+    result = await db.execute(select(*columns).where(User.cognito_sub == cognito_sub))
+    row = result.one_or_none()
+    if row is None:
+        return None
+    principal = Principal(*row[:4])
+    principal_cache.put(cognito_sub, principal, generation)
+    return principal
+
+
 async def get_tenant_db(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -23,49 +72,67 @@ async def get_tenant_db(
     tables reference this variable, so every query in the request
     automatically sees only that company's rows.
 
+    Resolving the user and setting the variable take a single round trip.
+    The caller's Principal is kept in ``db.info["principal"]``.
+
     Raises 401 if the Cognito sub has no matching user record (i.e. the user
     was created in Cognito but has not yet been provisioned in the database).
     """
-    cognito_sub = current_user.get("sub")
-    result = await db.execute(select(User).where(User.cognito_sub == cognito_sub))
-    user = result.scalar_one_or_none()
+    principal = await _load_principal(current_user.get("sub"), db, activate_tenant=True)
 
-    if user is None:
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not provisioned. Contact your administrator.",
         )
 
-    # SET LOCAL is scoped to the current transaction and is automatically
-    # cleared when the session is returned to the pool.
-    await db.execute(
-        text("SET LOCAL app.current_company_id = :cid"),
-        {"cid": str(user.company_id)},
-    )
-
+    db.info["principal"] = principal
     yield db
 
 
 TenantDB = Annotated[AsyncSession, Depends(get_tenant_db)]
 
 
+def require_permission(permission: str) -> Callable[..., Awaitable[Principal]]:
+    """Dependency factory: 403 unless the caller holds ``permission``.
+
+    Usage::
+
+        @router.post("/emissions", dependencies=[Depends(require_permission("emissions:write"))])
+    """
+
+    permission = sys.intern(permission)
+
+    async def check_permission(db: TenantDB) -> Principal:
+        principal: Principal = db.info["principal"]
+        allowed = await permission_resolver.has_permission(
+            db, principal.company_id, principal.user_id, permission
+        )
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing permission '{permission}'.",
+            )
+        return principal
+
+    return check_permission
+
+
 async def require_superadmin(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+) -> Principal:
     """Verify the caller is a provisioned super-admin.
 
     Super-admins operate outside any single company, so RLS is not set.
-    Returns the User ORM object so the endpoint has access to it if needed.
+    Returns the caller's Principal so the endpoint has access to it if needed.
     """
-    cognito_sub = current_user.get("sub")
-    result = await db.execute(select(User).where(User.cognito_sub == cognito_sub))
-    user = result.scalar_one_or_none()
+    principal = await _load_principal(current_user.get("sub"), db)
 
-    if user is None or not user.is_superadmin:
+    if principal is None or not principal.is_superadmin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Super-admin access required.",
         )
 
-    return user
+    return principal
@@ -0,0 +1,61 @@
+"""Per-route HTTP request metrics.
+
+Requests are labelled by route template (``/admin/companies/{company_id}/users``)
+rather than raw path, so label cardinality stays bounded; requests that
+match no route share the ``<unmatched>`` label.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import registry
+
+REQUEST_LABELS = ("method", "route", "status")
+
+request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    labelnames=("method", "route"),
+)
+requests_total = registry.counter(
+    "http_requests_total",
+    "HTTP requests by route and status code.",
+    labelnames=REQUEST_LABELS,
+)
+requests_in_progress = registry.gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served.",
+)
+
+
+class HTTPMetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        requests_in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            requests_in_progress.dec()
+            # The router records the matched route in the scope.
+            route = scope.get("route")
+            template = getattr(route, "path", "<unmatched>")
+            method = scope["method"]
+            request_duration_seconds.labels(method, template).observe(elapsed)
+            requests_total.labels(method, template, str(status_code)).inc()
@@ -1,15 +1,72 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app import metrics
+from app.auth.catalogue import PERMISSION_CATALOGUE_CHANNEL, catalogue_store
+from app.auth.jwks import jwks_store
+from app.auth.permissions import TENANT_PERMISSIONS_CHANNEL, permission_resolver
+from app.auth.principals import PRINCIPAL_CHANNEL, principal_cache
 from app.config import settings
+from app.database import engine, warm_up_pool
+from app.db_instrumentation import DBInstrumentationMiddleware
+from app.http_metrics import HTTPMetricsMiddleware
+from app.notifications import notification_listener
 from app.routers import health
 from app.routers import admin
+from app.routers import metrics as metrics_router
+from app.routers import uploads
+from app.services import cognito as cognito_service
+from app.services import s3 as s3_service
+from app.services.emission_factors import EMISSION_FACTORS_CHANNEL, factor_store
+
+notification_listener.subscribe(PRINCIPAL_CHANNEL, principal_cache.handle_notification)
+notification_listener.subscribe(
+    PERMISSION_CATALOGUE_CHANNEL, catalogue_store.handle_notification
+)
+notification_listener.subscribe(
+    TENANT_PERMISSIONS_CHANNEL, permission_resolver.handle_notification
+)
+notification_listener.subscribe(EMISSION_FACTORS_CHANNEL, factor_store.handle_notification)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm per-process state before the worker starts accepting traffic.
+
+    Uvicorn only reports the worker ready once this yields, so the first
+    requests after a deploy find an open pool, loaded signing keys, the
+    permission catalogue and the emission-factor index.
+    """
+    await asyncio.gather(
+        warm_up_pool(settings.db_pool_warmup_connections),
+        jwks_store.start(),
+        catalogue_store.start(),
+        factor_store.start(),
+    )
+    await notification_listener.start()
+    if metrics.exporter is not None:
+        await metrics.exporter.start()
+    yield
+    if metrics.exporter is not None:
+        await metrics.exporter.stop()
+    await notification_listener.stop()
+    await catalogue_store.stop()
+    await factor_store.stop()
+    await jwks_store.stop()
+    cognito_service.client.shutdown()
+    s3_service.client.shutdown()
+    await engine.dispose()
+
 
 app = FastAPI(
     title="EmissionTracker API",
     version="0.1.0",
     docs_url="/docs" if settings.app_env != "production" else None,
     redoc_url="/redoc" if settings.app_env != "production" else None,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -20,5 +77,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    DBInstrumentationMiddleware,
+    expose_headers=settings.app_env != "production",
+    n_plus_one_threshold=settings.n_plus_one_threshold,
+    slow_statement_seconds=settings.slow_statement_seconds,
+)
+
+# Added last so it is outermost and times the whole request.
+app.add_middleware(HTTPMetricsMiddleware)
+
 app.include_router(health.router)
 app.include_router(admin.router)
+app.include_router(uploads.router)
+app.include_router(metrics_router.router)
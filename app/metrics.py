@@ -0,0 +1,308 @@
+"""Low-overhead in-process metrics with Prometheus text exposition.
+
+Modules create their metrics on the shared ``registry`` at import time and
+update them on the request path; recording is a dict lookup plus a few
+integer increments, with no locks (everything runs on the event loop).
+
+Multi-worker deployments set ``metrics_multiproc_dir`` to a directory
+shared by all uvicorn workers.  Each worker then periodically writes a
+JSON snapshot of its metrics there, and ``/metrics`` (whichever worker
+serves it) sums the snapshots of every worker.  Counters and histograms of
+workers that exited cleanly are kept so totals never go backwards; their
+gauges are dropped.  Clear the directory when deploying, as with
+prometheus_client's multiprocess mode.
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import math
+import os
+from bisect import bisect_left
+from typing import Callable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, tuned for request- and query-level latencies.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is a bisect and three increments."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        # One slot per bucket plus a final +Inf slot.
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        """Cumulative bucket counts keyed by upper bound, plus count and sum."""
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, n in zip((*self.buckets, math.inf), self.counts):
+            cumulative += n
+            buckets[_format_bound(bound)] = cumulative
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class MetricFamily:
+    """A named metric and its children, one per combination of label values."""
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        factory: Callable[[], Histogram | Counter | Gauge],
+    ) -> None:
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._factory = factory
+        self._children: dict[tuple[str, ...], Histogram | Counter | Gauge] = {}
+        # Unlabeled counters and gauges may instead be read at collection time.
+        self.function: Callable[[], float] | None = None
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._factory()
+        return child
+
+    def collect(self) -> dict[str, float | dict]:
+        """Samples keyed by JSON-encoded label values."""
+        if self.function is not None:
+            return {json.dumps([]): float(self.function())}
+        samples: dict[str, float | dict] = {}
+        for values, child in self._children.items():
+            key = json.dumps(list(values))
+            samples[key] = child.snapshot() if isinstance(child, Histogram) else child.value
+        return samples
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._families: dict[str, MetricFamily] = {}
+
+    def _add(self, family: MetricFamily) -> MetricFamily:
+        if family.name in self._families:
+            raise ValueError(f"Metric {family.name!r} is already registered")
+        self._families[family.name] = family
+        return family
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        function: Callable[[], float] | None = None,
+    ):
+        family = self._add(MetricFamily("counter", name, documentation, labelnames, Counter))
+        family.function = function
+        return family if labelnames or function else family.labels()
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        function: Callable[[], float] | None = None,
+    ):
+        family = self._add(MetricFamily("gauge", name, documentation, labelnames, Gauge))
+        family.function = function
+        return family if labelnames or function else family.labels()
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        instance: Histogram | None = None,
+    ):
+        """Register a histogram; ``instance`` adopts an existing unlabeled one."""
+        factory = (lambda: instance) if instance is not None else (lambda: Histogram(buckets))
+        family = self._add(MetricFamily("histogram", name, documentation, labelnames, factory))
+        return family if labelnames else family.labels()
+
+    def snapshot(self, *, include_gauges: bool = True) -> dict:
+        return {
+            name: {
+                "kind": family.kind,
+                "help": family.documentation,
+                "labelnames": list(family.labelnames),
+                "samples": family.collect(),
+            }
+            for name, family in self._families.items()
+            if include_gauges or family.kind != "gauge"
+        }
+
+
+registry = Registry()
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(bound)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: list[str], values: list[str], extra: tuple[str, str] | None = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render(snapshot: dict) -> str:
+    """Render a (possibly merged) snapshot in the Prometheus text format."""
+    lines: list[str] = []
+    for name, family in snapshot.items():
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        names = family["labelnames"]
+        for key, sample in family["samples"].items():
+            values = json.loads(key)
+            if family["kind"] != "histogram":
+                lines.append(f"{name}{_labels(names, values)} {sample}")
+                continue
+            for bound, count in sample["buckets"].items():
+                lines.append(f"{name}_bucket{_labels(names, values, ('le', bound))} {count}")
+            lines.append(f"{name}_sum{_labels(names, values)} {sample['sum']}")
+            lines.append(f"{name}_count{_labels(names, values)} {sample['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def merge(snapshots: list[dict]) -> dict:
+    """Sum snapshots from several workers sample by sample."""
+    merged: dict = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, {**family, "samples": {}})
+            samples = target["samples"]
+            for key, sample in family["samples"].items():
+                current = samples.get(key)
+                if current is None:
+                    samples[key] = json.loads(json.dumps(sample))
+                elif isinstance(sample, dict):
+                    current["count"] += sample["count"]
+                    current["sum"] += sample["sum"]
+                    for bound, count in sample["buckets"].items():
+                        current["buckets"][bound] = current["buckets"].get(bound, 0) + count
+                else:
+                    samples[key] = current + sample
+    return merged
+
+
+class MultiprocessExporter:
+    """Shares this worker's metrics with its siblings through a directory."""
+
+    def __init__(self, directory: str, interval: float) -> None:
+        self.directory = directory
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    @property
+    def path(self) -> str:
+        # Resolved lazily: the exporter may be created before workers fork.
+        return os.path.join(self.directory, f"worker-{os.getpid()}.json")
+
+    def write(self, *, include_gauges: bool = True) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(registry.snapshot(include_gauges=include_gauges), f)
+        os.replace(tmp, self.path)
+
+    def collect(self) -> dict:
+        self.write()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "worker-*.json")):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                logger.warning("Skipping unreadable metrics snapshot %s", path)
+        return merge(snapshots)
+
+    async def start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.write()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="metrics-flush")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Keep cumulative totals; this worker's gauges no longer mean anything.
+        self.write(include_gauges=False)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.write()
+            except OSError:
+                logger.exception("Writing metrics snapshot to %s failed", self.path)
+
+
+def collect() -> dict:
+    """Metrics for ``/metrics``: this worker's, or all workers' when shared."""
+    if exporter is not None:
+        return exporter.collect()
+    return registry.snapshot()
+
+
+exporter: MultiprocessExporter | None = (
+    MultiprocessExporter(settings.metrics_multiproc_dir, settings.metrics_flush_interval_seconds)
+    if settings.metrics_multiproc_dir
+    else None
+)
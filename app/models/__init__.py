@@ -7,3 +7,5 @@ from app.models.tenant import (  # noqa: F401
     RolePermission,
     UserRole,
 )
+from app.models.emissions import ActivityRecord, EmissionFactor  # noqa: F401
+from app.models.uploads import Upload  # noqa: F401
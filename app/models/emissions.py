@@ -0,0 +1,116 @@
+"""Emission activity data and the emission-factor library.
+
+Each ActivityRecord is one quantity of activity (fuel burned, electricity
+bought, distance travelled, ...) attributed to a company and a period.
+Tenants log millions of these a year, so ``activity_records`` is range
+partitioned by month on ``period``:
+
+  - queries filtered on ``period`` only scan the matching partitions;
+  - retention drops whole partitions instead of deleting rows;
+  - the primary key must include the partition key, hence (id, period).
+
+Partitions are created by the ``create_activity_record_partition()``
+database function (see the migration and scripts/manage_partitions.py),
+which also applies the tenant RLS policy to each partition.
+
+EmissionFactor is a global (not tenant-scoped) library of per-gas factors;
+calculations read it through the in-memory index in
+app/services/emission_factors.py.
+"""
+
+import datetime
+import decimal
+import uuid
+
+from sqlalchemy import (
+    UUID,
+    Date,
+    ForeignKey,
+    Index,
+    Numeric,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.base import TenantMixin
+
+# Monthly partitions are named activity_records_pYYYYMM.
+ACTIVITY_PARTITION_PREFIX = "activity_records_p"
+
+
+class ActivityRecord(TenantMixin, Base):
+    __tablename__ = "activity_records"
+    __table_args__ = (
+        # Tenant-scoped period scans; also serves plain company_id lookups.
+        Index("ix_activity_records_company_period", "company_id", "period"),
+        # Rows arrive roughly in period order, so a BRIN index stays tiny.
+        Index("ix_activity_records_period_brin", "period", postgresql_using="brin"),
+        # Finds an upload's rows when it is deleted or reprocessed.
+        Index("ix_activity_records_upload_id", "upload_id"),
+        {"postgresql_partition_by": "RANGE (period)"},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    # Covered by ix_activity_records_company_period, so no single-column index.
+    company_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("companies.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # Date the activity took place; the partition key.
+    period: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    # GHG Protocol scope: 1, 2 or 3.
+    scope: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    # e.g. "stationary_combustion", "purchased_electricity"
+    category: Mapped[str] = mapped_column(String(100), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    quantity: Mapped[decimal.Decimal] = mapped_column(Numeric(20, 6), nullable=False)
+    # e.g. "kWh", "L", "km"
+    unit: Mapped[str] = mapped_column(String(32), nullable=False)
+    # Calculated emissions in kg CO2e; NULL until calculated.
+    co2e_kg: Mapped[decimal.Decimal | None] = mapped_column(Numeric(20, 6), nullable=True)
+    # The file the record was loaded from, if any.
+    upload_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("uploads.id", ondelete="CASCADE", name="activity_records_upload_id_fkey"),
+        nullable=True,
+    )
+
+
+class EmissionFactor(Base):
+    """kg of each greenhouse gas emitted per unit of an activity.
+
+    A factor applies to activity of ``category`` measured in ``unit`` in
+    ``region`` between ``valid_from`` and ``valid_to`` (exclusive; NULL means
+    open-ended), as published in ``dataset``.
+    """
+
+    __tablename__ = "emission_factors"
+    __table_args__ = (
+        UniqueConstraint(
+            "dataset", "category", "unit", "region", "valid_from",
+            name="uq_emission_factors_key_valid_from",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    # e.g. "DEFRA-2024", "EPA-eGRID-2023"
+    dataset: Mapped[str] = mapped_column(String(100), nullable=False)
+    category: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Canonical unit, see app.services.calculation.UNIT_CONVERSIONS.
+    unit: Mapped[str] = mapped_column(String(32), nullable=False)
+    # ISO 3166 code, or "GLOBAL"
+    region: Mapped[str] = mapped_column(String(16), nullable=False)
+    valid_from: Mapped[datetime.date] = mapped_column(Date, nullable=False)
+    valid_to: Mapped[datetime.date | None] = mapped_column(Date, nullable=True)
+    co2_kg: Mapped[decimal.Decimal] = mapped_column(Numeric(24, 12), nullable=False)
+    ch4_kg: Mapped[decimal.Decimal] = mapped_column(Numeric(24, 12), nullable=False)
+    n2o_kg: Mapped[decimal.Decimal] = mapped_column(Numeric(24, 12), nullable=False)
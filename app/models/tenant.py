@@ -13,7 +13,7 @@ e.g. "settings:read", "emissions:write", "users:manage".
 
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, String, Text, UniqueConstraint, UUID
+from sqlalchemy import Boolean, ForeignKey, Index, String, Text, UniqueConstraint, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -22,6 +22,13 @@ from app.models.base import TimestampMixin, TenantMixin
 
 class Company(TimestampMixin, Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        # Keyset pagination order for the admin company listing.
+        Index("ix_companies_name_id", "name", "id"),
+        # text_pattern_ops lets LIKE 'prefix%' use the index under any collation.
+        Index("ix_companies_name_pattern", "name", postgresql_ops={"name": "text_pattern_ops"}),
+        Index("ix_companies_slug_pattern", "slug", postgresql_ops={"slug": "text_pattern_ops"}),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -0,0 +1,46 @@
+"""Files uploaded by tenants, and their processing status.
+
+Files streamed through the API are processed inline (processing ->
+completed | failed).  Files sent straight to S3 with a presigned URL start
+as pending and are queued once the client reports the upload complete;
+``uploads`` with status queued is the processing queue (see
+app/services/upload_queue.py).
+"""
+
+import uuid
+
+from sqlalchemy import UUID, BigInteger, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.base import TenantMixin
+
+# Upload.status values
+UPLOAD_PENDING = "pending"
+UPLOAD_QUEUED = "queued"
+UPLOAD_PROCESSING = "processing"
+UPLOAD_COMPLETED = "completed"
+UPLOAD_FAILED = "failed"
+
+
+class Upload(TenantMixin, Base):
+    __tablename__ = "uploads"
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    uploaded_by: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    content_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Object key in settings.s3_bucket_name, "<company_id>/uploads/<id>/<filename>"
+    s3_key: Mapped[str] = mapped_column(String(1024), nullable=False)
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # ETag of the stored object, recorded when a presigned upload completes.
+    s3_etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=UPLOAD_PROCESSING)
+    row_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Validation or processing errors, as JSON.
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
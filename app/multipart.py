@@ -0,0 +1,150 @@
+"""Streaming reader for multipart/form-data request bodies.
+
+Starlette's ``request.form()`` spools every file part to a temporary file
+before the endpoint runs.  ``MultipartStream`` instead hands out a file
+part's bytes as they arrive from the client, so they can be forwarded (to
+S3, to a parser) while memory stays bounded by the ASGI chunk size.
+"""
+
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+
+class MultipartError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class FilePart:
+    field: str
+    filename: str
+    content_type: str | None
+
+
+class MultipartStream:
+    """Walks the parts of a multipart body as it is received.
+
+    Usage::
+
+        stream = MultipartStream(request)
+        part = await stream.next_file("file")
+        async for chunk in stream.iter_data():
+            ...
+    """
+
+    def __init__(self, request: Request) -> None:
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise MultipartError("Expected a multipart/form-data body.")
+        self._body = request.stream()
+        self._events: deque[tuple[str, object]] = deque()
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: dict[bytes, bytes] = {}
+        self._finished = False
+        self._parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_end": self._on_end,
+            },
+        )
+
+    # --- parser callbacks ---
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        self._events.append(("headers", self._headers))
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self._events.append(("data", bytes(data[start:end])))
+
+    def _on_part_end(self) -> None:
+        self._events.append(("end", None))
+
+    def _on_end(self) -> None:
+        self._events.append(("done", None))
+
+    # ---
+
+    async def _next_event(self) -> tuple[str, object]:
+        while not self._events:
+            if self._finished:
+                raise MultipartError("Incomplete multipart body.")
+            try:
+                chunk = await self._body.__anext__()
+            except StopAsyncIteration:
+                self._finished = True
+                self._parser.finalize()
+                continue
+            if chunk:
+                try:
+                    self._parser.write(chunk)
+                except Exception as e:
+                    raise MultipartError(f"Malformed multipart body: {e}") from e
+        return self._events.popleft()
+
+    async def next_file(self, field: str) -> FilePart | None:
+        """Advance to the next file part named ``field``; None if there is none.
+
+        Parts before it are skipped.  Call ``iter_data()`` to read its bytes.
+        """
+        while True:
+            kind, value = await self._next_event()
+            if kind == "done":
+                return None
+            if kind != "headers":
+                continue
+            headers: dict[bytes, bytes] = value  # type: ignore[assignment]
+            _, disposition = parse_options_header(headers.get(b"content-disposition", b""))
+            name = disposition.get(b"name", b"").decode("utf-8", "replace")
+            filename = disposition.get(b"filename")
+            if name != field or filename is None:
+                await self._skip_part()
+                continue
+            # Browsers send a bare name, but some clients send a full path.
+            basename = os.path.basename(filename.decode("utf-8", "replace").replace("\\", "/"))
+            content_type = headers.get(b"content-type")
+            return FilePart(
+                field=name,
+                filename=basename,
+                content_type=content_type.decode("latin-1") if content_type else None,
+            )
+
+    async def _skip_part(self) -> None:
+        while (await self._next_event())[0] != "end":
+            pass
+
+    async def iter_data(self) -> AsyncIterator[bytes]:
+        """Yield the current part's bytes until the part ends."""
+        while True:
+            kind, value = await self._next_event()
+            if kind == "end":
+                return
+            if kind == "data":
+                yield value  # type: ignore[misc]
@@ -0,0 +1,146 @@
+"""Postgres LISTEN/NOTIFY fan-out for cross-process cache invalidation.
+
+Each worker keeps one dedicated autocommit connection that LISTENs on every
+subscribed channel and dispatches payloads to in-process handlers.
+Notifications are sent by database triggers (or ``pg_notify`` calls) inside
+the writing transaction, so they are only delivered if the change commits.
+
+If the listener connection drops, notifications sent in the meantime are
+lost.  After reconnecting, every handler is therefore called with ``None``,
+meaning "assume anything may have changed".
+
+``ReloadingStore`` is the base for per-process copies of small, rarely
+changing tables (the permission catalogue, the emission-factor library)
+that are reloaded in the background whenever their channel fires.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Callable
+
+import psycopg
+from psycopg import sql
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+NotificationHandler = Callable[[str | None], None]
+
+
+class ReloadingStore(ABC):
+    """Loads a snapshot at startup and reloads it when notified.
+
+    Subclasses implement ``load()``, which builds the snapshot and swaps it
+    in, and name what they hold in ``description`` for logs.  Notifications
+    never block the listener: they schedule one background reload, and a
+    burst of them (e.g. a bulk import) is coalesced into a single reload
+    after the one in flight.  A failed reload is logged and the previous
+    snapshot stays in service until the next notification.
+    """
+
+    description: str
+
+    def __init__(self) -> None:
+        self._reload_pending = False
+        self._reload_task: asyncio.Task | None = None
+
+    @abstractmethod
+    async def load(self) -> object:
+        """Build the store's state from the database and swap it in."""
+
+    async def start(self) -> None:
+        """Initial load.  A failure is logged; the store loads on demand."""
+        try:
+            await self.load()
+        except Exception:
+            logger.exception("Initial %s load failed", self.description)
+
+    async def stop(self) -> None:
+        if self._reload_task is None:
+            return
+        self._reload_task.cancel()
+        try:
+            await self._reload_task
+        except asyncio.CancelledError:
+            pass
+        self._reload_task = None
+
+    def handle_notification(self, payload: str | None) -> None:
+        self._reload_pending = True
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.create_task(
+                self._reload(), name=f"{self.description.replace(' ', '-')}-reload"
+            )
+
+    async def _reload(self) -> None:
+        while self._reload_pending:
+            self._reload_pending = False
+            try:
+                await self.load()
+            except Exception:
+                logger.exception("%s reload failed", self.description.capitalize())
+                return
+
+
+class NotificationListener:
+    def __init__(self, conninfo: str, *, reconnect_delay: float = 5.0) -> None:
+        self.conninfo = conninfo
+        self.reconnect_delay = reconnect_delay
+        self._handlers: dict[str, list[NotificationHandler]] = {}
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, channel: str, handler: NotificationHandler) -> None:
+        """Register ``handler`` for ``channel``.  Call before ``start()``."""
+        self._handlers.setdefault(channel, []).append(handler)
+
+    async def start(self) -> None:
+        if self._handlers and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="pg-notify-listener")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _dispatch(self, channel: str, payload: str | None) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Notification handler for %r failed", channel)
+
+    async def _run(self) -> None:
+        connected_before = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.conninfo, autocommit=True
+                ) as conn:
+                    for channel in self._handlers:
+                        await conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+                    if connected_before:
+                        for channel in self._handlers:
+                            self._dispatch(channel, None)
+                    connected_before = True
+                    async for message in conn.notifies():
+                        self._dispatch(message.channel, message.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("LISTEN connection lost; reconnecting")
+            await asyncio.sleep(self.reconnect_delay)
+
+
+notification_listener = NotificationListener(
+    make_url(settings.database_url)
+    .set(drivername="postgresql")
+    .render_as_string(hide_password=False)
+)
@@ -0,0 +1,29 @@
+"""Fast JSON responses.
+
+FastAPI serializes ``response_model`` data straight to JSON bytes with
+pydantic-core, so endpoints keep the default response class: setting a
+custom default class would route them back through ``jsonable_encoder``.
+
+Large listings can skip Pydantic models entirely: select plain columns and
+return the row mappings in a ``RowsJSONResponse``, which pydantic-core
+encodes directly (UUIDs and datetimes render exactly as they would through
+the response model).  The endpoint's ``response_model`` still documents the
+shape in OpenAPI.
+"""
+
+from typing import Any, Iterable
+
+from fastapi import Response
+from pydantic_core import to_json
+from sqlalchemy import RowMapping
+
+
+class RowsJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def rows_to_dicts(rows: Iterable[RowMapping]) -> list[dict]:
+    return [dict(row) for row in rows]
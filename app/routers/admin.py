@@ -5,22 +5,38 @@ All routes require the caller to be a provisioned super-admin user
 these routes because super-admins operate across all tenants.
 """
 
+import asyncio
+import base64
+import binascii
+import json
 import uuid
 
-import boto3
 import botocore.exceptions
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, any_, bindparam, func, insert, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.config import settings
 from app.database import get_db
 from app.dependencies import require_superadmin
 from app.models.tenant import Company, User
+from app.responses import RowsJSONResponse, rows_to_dicts
+from app.services import cognito as cognito_service
+from app.services.export import MEDIA_TYPES, ExportFormat, stream_export
 from app.schemas.admin import (
+    BatchCompanyResult,
+    BatchUserResult,
+    CompanyPage,
     CompanyResponse,
+    CreateCompaniesBatchRequest,
+    CreateCompaniesBatchResponse,
     CreateCompanyRequest,
     ProvisionUserRequest,
+    ProvisionUsersBatchRequest,
+    ProvisionUsersBatchResponse,
     UserResponse,
 )
 
@@ -31,11 +47,87 @@ router = APIRouter(
 )
 
 
-@router.get("/companies", response_model=list[CompanyResponse])
-async def list_companies(db: AsyncSession = Depends(get_db)) -> list[Company]:
-    """List all tenant companies."""
-    result = await db.execute(select(Company).order_by(Company.name))
-    return list(result.scalars().all())
+# PostgreSQL SQLSTATE codes for constraint violations.
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def _sqlstate(error: IntegrityError) -> str | None:
+    return getattr(error.orig, "sqlstate", None)
+
+
+def _encode_cursor(name: str, company_id: uuid.UUID) -> str:
+    raw = json.dumps([name, str(company_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, uuid.UUID]:
+    invalid = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor.",
+    )
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise invalid
+    # Cursors come from clients, so check the shape before trusting it.
+    if not (
+        isinstance(decoded, list)
+        and len(decoded) == 2
+        and all(isinstance(part, str) for part in decoded)
+    ):
+        raise invalid
+    name, company_id = decoded
+    try:
+        return name, uuid.UUID(company_id)
+    except ValueError:
+        raise invalid
+
+
+@router.get("/companies", response_model=CompanyPage)
+async def list_companies(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = None,
+    name_prefix: str | None = None,
+    slug_prefix: str | None = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_db),
+) -> RowsJSONResponse:
+    """List tenant companies ordered by name, one keyset page at a time.
+
+    Pages are seeked with ``(name, id) > cursor`` on ``ix_companies_name_id``,
+    so each page costs the same regardless of how deep into the list it is.
+    """
+    filters = []
+    if name_prefix:
+        filters.append(Company.name.startswith(name_prefix, autoescape=True))
+    if slug_prefix:
+        filters.append(Company.slug.startswith(slug_prefix, autoescape=True))
+
+    stmt = (
+        select(Company.id, Company.name, Company.slug, Company.created_at)
+        .where(*filters)
+        .order_by(Company.name, Company.id)
+    )
+    if cursor is not None:
+        stmt = stmt.where(tuple_(Company.name, Company.id) > tuple_(*_decode_cursor(cursor)))
+
+    # Fetch one extra row to learn whether another page follows.
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = result.mappings().all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1]["name"], rows[-1]["id"])
+
+    total = None
+    if include_total:
+        total = await db.scalar(select(func.count()).select_from(Company).where(*filters))
+
+    # Plain rows are encoded directly; no ORM objects or CompanyResponse models.
+    return RowsJSONResponse(
+        {"items": rows_to_dicts(rows), "next_cursor": next_cursor, "total": total}
+    )
 
 
 @router.post(
@@ -47,21 +139,71 @@ async def create_company(
     body: CreateCompanyRequest,
     db: AsyncSession = Depends(get_db),
 ) -> Company:
-    """Create a new tenant company."""
+    """Create a new tenant company.
 
-    # Check slug uniqueness
-    existing = await db.execute(select(Company).where(Company.slug == body.slug))
-    if existing.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"A company with slug '{body.slug}' already exists.",
+    Slug uniqueness is enforced by the unique constraint rather than a
+    pre-check, and RETURNING hands back server defaults without a refresh.
+    """
+    try:
+        company = await db.scalar(
+            insert(Company)
+            .values(id=uuid.uuid4(), name=body.name, slug=body.slug)
+            .returning(Company)
         )
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _sqlstate(e) == UNIQUE_VIOLATION:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A company with slug '{body.slug}' already exists.",
+            )
+        raise
+    return company
 
-    company = Company(id=uuid.uuid4(), name=body.name, slug=body.slug)
-    db.add(company)
+
+@router.post("/companies:batch", response_model=CreateCompaniesBatchResponse)
+async def create_companies_batch(
+    body: CreateCompaniesBatchRequest,
+    db: AsyncSession = Depends(get_db),
+) -> CreateCompaniesBatchResponse:
+    """Create many tenant companies in a single INSERT.
+
+    Slugs that already exist (or repeat within the batch) are skipped by
+    ``ON CONFLICT (slug) DO NOTHING`` and reported as conflicts; the rest
+    are created.  The whole batch is one round trip plus the commit.
+    """
+    rows = []
+    seen: set[str] = set()
+    for item in body.companies:
+        if item.slug not in seen:
+            seen.add(item.slug)
+            rows.append({"id": uuid.uuid4(), "name": item.name, "slug": item.slug})
+
+    stmt = (
+        pg_insert(Company)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[Company.slug])
+        .returning(Company.id, Company.name, Company.slug, Company.created_at)
+    )
+    result = await db.execute(stmt)
+    created = {row.slug: row for row in result}
     await db.commit()
-    await db.refresh(company)
-    return company
+
+    results = []
+    for item in body.companies:
+        row = created.pop(item.slug, None)
+        if row is None:
+            results.append(BatchCompanyResult(slug=item.slug, status="conflict"))
+        else:
+            results.append(
+                BatchCompanyResult(
+                    slug=item.slug,
+                    status="created",
+                    company=CompanyResponse.model_validate(row),
+                )
+            )
+    return CreateCompaniesBatchResponse(results=results)
 
 
 @router.post(
@@ -77,50 +219,178 @@ async def provision_user(
     """Provision a Cognito user into a company.
 
     Links a Cognito sub + email to the given company so the user can
-    authenticate and have RLS applied to their requests.
+    authenticate and have RLS applied to their requests.  A missing company
+    or an already-provisioned sub is detected from the INSERT's constraint
+    violation rather than separate lookups.
     """
 
-    # Verify company exists
-    result = await db.execute(select(Company).where(Company.id == company_id))
-    company = result.scalar_one_or_none()
-    if company is None:
+    # Verify the cognito_sub exists in Cognito
+    try:
+        found = await cognito_service.user_exists(body.cognito_sub)
+    except (
+        asyncio.TimeoutError,
+        botocore.exceptions.ConnectTimeoutError,
+        botocore.exceptions.ReadTimeoutError,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Timed out verifying the user with Cognito.",
+        )
+    except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError):
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Could not verify the user with Cognito. Try again later.",
+        )
+    if not found:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Company {company_id} not found.",
+            detail=f"Cognito user '{body.cognito_sub}' not found in user pool.",
         )
 
-    # Verify the cognito_sub exists in Cognito
-    cognito = boto3.client("cognito-idp", region_name=settings.cognito_region)
     try:
-        cognito.admin_get_user(
-            UserPoolId=settings.cognito_user_pool_id,
-            Username=body.cognito_sub,
+        user = await db.scalar(
+            insert(User)
+            .values(
+                id=uuid.uuid4(),
+                cognito_sub=body.cognito_sub,
+                email=body.email,
+                company_id=company_id,
+            )
+            .returning(User)
         )
-    except botocore.exceptions.ClientError as e:
-        if e.response["Error"]["Code"] == "UserNotFoundException":
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _sqlstate(e) == FOREIGN_KEY_VIOLATION:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Cognito user '{body.cognito_sub}' not found in user pool.",
+                detail=f"Company {company_id} not found.",
+            )
+        if _sqlstate(e) == UNIQUE_VIOLATION:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"User with cognito_sub '{body.cognito_sub}' is already provisioned.",
             )
         raise
+    return user
+
+
+@router.post(
+    "/companies/{company_id}/users:batch",
+    response_model=ProvisionUsersBatchResponse,
+)
+async def provision_users_batch(
+    company_id: uuid.UUID,
+    body: ProvisionUsersBatchRequest,
+    db: AsyncSession = Depends(get_db),
+) -> ProvisionUsersBatchResponse:
+    """Provision many Cognito users into a company.
+
+    Subs already in the database are found with one ``= ANY(...)`` query,
+    the rest are verified against Cognito concurrently, and every verified
+    user is inserted with a single statement.  Each requested user gets an
+    outcome in the response instead of failing the whole batch.
+    """
+    result = await db.execute(select(Company.id).where(Company.id == company_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Company {company_id} not found.",
+        )
+
+    outcomes: dict[int, BatchUserResult] = {}
+    first_index: dict[str, int] = {}
+    for i, item in enumerate(body.users):
+        if item.cognito_sub in first_index:
+            outcomes[i] = BatchUserResult(cognito_sub=item.cognito_sub, status="duplicate")
+        else:
+            first_index[item.cognito_sub] = i
 
-    # Check cognito_sub is not already provisioned
     existing = await db.execute(
-        select(User).where(User.cognito_sub == body.cognito_sub)
+        select(User.cognito_sub).where(
+            User.cognito_sub == any_(bindparam("subs", list(first_index), type_=ARRAY(String)))
+        )
     )
-    if existing.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"User with cognito_sub '{body.cognito_sub}' is already provisioned.",
+    for sub in existing.scalars():
+        i = first_index.pop(sub)
+        outcomes[i] = BatchUserResult(cognito_sub=sub, status="already_provisioned")
+
+    checks = await cognito_service.users_exist(list(first_index))
+    rows = []
+    for sub, found in checks.items():
+        i = first_index[sub]
+        if isinstance(found, Exception):
+            outcomes[i] = BatchUserResult(cognito_sub=sub, status="cognito_error", detail=str(found))
+        elif not found:
+            outcomes[i] = BatchUserResult(cognito_sub=sub, status="cognito_not_found")
+        else:
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "cognito_sub": sub,
+                    "email": body.users[i].email,
+                    "company_id": company_id,
+                    "is_active": True,
+                    "is_superadmin": False,
+                }
+            )
+
+    if rows:
+        # A concurrent request may have provisioned a sub since the check above.
+        stmt = (
+            pg_insert(User)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[User.cognito_sub])
+            .returning(*User.__table__.c)
         )
+        inserted = {row.cognito_sub: row for row in await db.execute(stmt)}
+        await db.commit()
+        for row in rows:
+            sub = row["cognito_sub"]
+            i = first_index[sub]
+            if sub in inserted:
+                outcomes[i] = BatchUserResult(
+                    cognito_sub=sub,
+                    status="created",
+                    user=UserResponse.model_validate(inserted[sub]),
+                )
+            else:
+                outcomes[i] = BatchUserResult(cognito_sub=sub, status="already_provisioned")
 
-    user = User(
-        id=uuid.uuid4(),
-        cognito_sub=body.cognito_sub,
-        email=body.email,
-        company_id=company_id,
+    return ProvisionUsersBatchResponse(results=[outcomes[i] for i in range(len(body.users))])
+
+
+def _export_response(stmt, fmt: ExportFormat, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
     )
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    return user
+
+
+@router.get("/export/companies")
+async def export_companies(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+) -> StreamingResponse:
+    """Stream every company as NDJSON or CSV."""
+    stmt = select(Company.id, Company.name, Company.slug, Company.created_at).order_by(
+        Company.name, Company.id
+    )
+    return _export_response(stmt, fmt, "companies")
+
+
+@router.get("/export/users")
+async def export_users(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+) -> StreamingResponse:
+    """Stream every provisioned user, across all companies, as NDJSON or CSV."""
+    stmt = select(
+        User.id,
+        User.email,
+        User.cognito_sub,
+        User.company_id,
+        User.is_active,
+        User.is_superadmin,
+        User.created_at,
+    ).order_by(User.company_id, User.email)
+    return _export_response(stmt, fmt, "users")
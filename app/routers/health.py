@@ -1,4 +1,12 @@
-from fastapi import APIRouter
+import asyncio
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy import text
+
+from app.auth.jwks import jwks_store
+from app.config import settings
+from app.database import engine, get_pool_stats
+from app.dependencies import require_superadmin
 
 router = APIRouter(tags=["health"])
 
@@ -6,3 +14,58 @@ router = APIRouter(tags=["health"])
 @router.get("/health")
 async def health_check() -> dict:
     return {"status": "ok"}
+
+
+@router.get("/health/pool", dependencies=[Depends(require_superadmin)])
+async def pool_stats() -> dict:
+    """Connection pool occupancy and checkout latency for this worker.
+
+    Super-admins only: it exposes pool internals.
+    """
+    return get_pool_stats()
+
+
+async def _ping_db() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+@router.get("/ready")
+async def readiness_check(response: Response) -> dict:
+    """Report whether this worker can serve traffic.
+
+    Returns 503 when the database does not answer within the timeout, the
+    pool is close to exhausted, or signing keys have never loaded, so the
+    load balancer drains the worker before latency collapses.
+
+    Stale signing keys are only reported: cached keys keep verifying tokens,
+    and failing readiness on a JWKS outage would pull every worker out of
+    rotation at once.
+    """
+    try:
+        await asyncio.wait_for(_ping_db(), timeout=settings.readiness_db_timeout_seconds)
+        database_ok = True
+    except Exception:
+        database_ok = False
+
+    pool = get_pool_stats()
+    pool_ok = pool["saturation"] < settings.readiness_max_pool_saturation
+
+    jwks_ok = jwks_store.loaded
+    jwks_age = jwks_store.age_seconds
+    jwks_stale = jwks_age is not None and jwks_age > settings.readiness_jwks_stale_after_seconds
+
+    ready = database_ok and pool_ok and jwks_ok
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if ready else "unavailable",
+        "database": {"ok": database_ok},
+        "pool": {
+            "ok": pool_ok,
+            "checked_out": pool["checked_out"],
+            "capacity": pool["capacity"],
+            "saturation": pool["saturation"],
+        },
+        "jwks": {"ok": jwks_ok, "age_seconds": jwks_age, "stale": jwks_stale},
+    }
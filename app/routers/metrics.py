@@ -0,0 +1,44 @@
+import hmac
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.metrics import collect, render
+
+router = APIRouter(tags=["metrics"])
+
+
+def require_metrics_token(authorization: Annotated[str | None, Header()] = None) -> None:
+    """401 unless the request carries ``Bearer <metrics_token>``.
+
+    The scraper cannot sign in through Cognito, so it gets a static token.
+    Without one configured the endpoint does not exist: like /health/pool it
+    exposes pool internals, and it should never be public.
+    """
+    if settings.metrics_token is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), settings.metrics_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(require_metrics_token)],
+)
+async def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint (all workers when multiprocess mode is on)."""
+    return PlainTextResponse(
+        render(collect()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
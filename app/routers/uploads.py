@@ -0,0 +1,267 @@
+"""Tenant file uploads.
+
+Activity-data spreadsheets are streamed straight from the request body to
+S3 and into ``activity_records``; see app/services/ingest.py.
+
+Larger files (invoices, meter exports) skip the API entirely: the client
+asks for a presigned URL, uploads to S3 directly, then calls the completion
+endpoint, which registers the object and queues it for processing.  Every
+object key is scoped to ``<company_id>/uploads/<upload_id>/``.
+"""
+
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
+
+import botocore.exceptions
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from app.auth.principals import Principal
+from app.config import settings
+from app.dependencies import TenantDB, require_permission
+from app.models.uploads import UPLOAD_FAILED, UPLOAD_PENDING, Upload
+from app.multipart import MultipartError, MultipartStream
+from app.schemas.uploads import PresignedUploadResponse, PresignUploadRequest, UploadResponse
+from app.services import s3 as s3_service
+from app.services.ingest import (
+    UploadFormatError,
+    UploadRejected,
+    error_report,
+    ingest,
+    upload_format,
+)
+from app.services.upload_queue import enqueue
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+# Fits uploads.filename (varchar(255)) and, with the key prefix, S3's limit
+# of 1024 UTF-8 bytes per key.
+MAX_FILENAME_BYTES = 255
+
+
+def _clean_filename(filename: str) -> str:
+    """Base name of a client-supplied filename, safe to store and use in a key.
+
+    Control characters are dropped and long names are shortened before the
+    extension, so the format still shows.
+    """
+    name = os.path.basename(filename.replace("\\", "/"))
+    name = "".join(ch for ch in name if ch.isprintable()).strip()
+    if len(name.encode()) > MAX_FILENAME_BYTES:
+        stem, ext = os.path.splitext(name)
+        ext = ext[:16]
+        budget = MAX_FILENAME_BYTES - len(ext.encode())
+        name = stem.encode()[:budget].decode("utf-8", "ignore") + ext
+    return name
+
+
+def _object_key(company_id: uuid.UUID, upload_id: uuid.UUID, filename: str) -> str:
+    return f"{company_id}/uploads/{upload_id}/{filename}"
+
+
+@router.post(
+    "/activity",
+    response_model=UploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"],
+                    }
+                }
+            },
+            "required": True,
+        }
+    },
+)
+async def upload_activity_data(
+    request: Request,
+    db: TenantDB,
+    principal: Annotated[Principal, Depends(require_permission("emissions:write"))],
+) -> Upload:
+    """Upload a CSV or XLSX file of activity records (multipart field ``file``).
+
+    Columns (header row, any order): period (YYYY-MM-DD), scope (1-3),
+    category, quantity, unit, and optionally description.  Quantities are
+    stored converted to the unit's canonical unit.
+
+    The body is processed as it streams in.  If any row is invalid nothing
+    is loaded and the response is 422 with the first errors; the upload is
+    still recorded as failed.
+    """
+    try:
+        stream = MultipartStream(request)
+        part = await stream.next_file("file")
+    except MultipartError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if part is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Missing multipart file field 'file'.",
+        )
+    filename = _clean_filename(part.filename)
+    fmt = upload_format(filename)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Only .csv and .xlsx files are supported.",
+        )
+
+    upload_id = uuid.uuid4()
+    upload = Upload(
+        id=upload_id,
+        company_id=principal.company_id,
+        uploaded_by=principal.user_id,
+        filename=filename,
+        content_type=part.content_type,
+        s3_key=_object_key(principal.company_id, upload_id, filename),
+    )
+    db.add(upload)
+    await db.flush()
+
+    try:
+        await ingest(db, upload, fmt, stream.iter_data())
+    except MultipartError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except (UploadRejected, UploadFormatError) as e:
+        report = error_report(e)
+        upload.status = UPLOAD_FAILED
+        upload.error = json.dumps(report)
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail={"upload_id": str(upload_id), **report},
+        )
+
+    await db.commit()
+    return upload
+
+
+@router.post(
+    "/presign",
+    response_model=PresignedUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def presign_upload(
+    body: PresignUploadRequest,
+    db: TenantDB,
+    principal: Annotated[Principal, Depends(require_permission("emissions:write"))],
+) -> PresignedUploadResponse:
+    """Issue a presigned URL for uploading one file directly to S3.
+
+    PUT URLs take the file as the raw request body; POST URLs take a
+    multipart form with ``fields`` followed by a ``file`` field, and S3
+    enforces the size limit itself.  Call ``POST /uploads/{id}/complete``
+    once the upload has finished.
+    """
+    max_bytes = settings.presigned_upload_max_bytes
+    if body.size_bytes is not None and body.size_bytes > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Files may be at most {max_bytes} bytes.",
+        )
+    filename = _clean_filename(body.filename)
+    if not filename:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Invalid filename.",
+        )
+
+    upload_id = uuid.uuid4()
+    key = _object_key(principal.company_id, upload_id, filename)
+    expires_in = settings.presigned_url_expiry_seconds
+    headers: dict[str, str] = {}
+    fields: dict[str, str] = {}
+    if body.method == "post":
+        url, fields = await s3_service.presign_post(key, body.content_type, max_bytes, expires_in)
+    else:
+        url, headers = await s3_service.presign_put(key, body.content_type, expires_in)
+
+    db.add(
+        Upload(
+            id=upload_id,
+            company_id=principal.company_id,
+            uploaded_by=principal.user_id,
+            filename=filename,
+            content_type=body.content_type,
+            s3_key=key,
+            status=UPLOAD_PENDING,
+        )
+    )
+    await db.commit()
+    return PresignedUploadResponse(
+        upload_id=upload_id,
+        method=body.method,
+        url=url,
+        fields=fields,
+        headers=headers,
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+    )
+
+
+@router.post("/{upload_id}/complete", response_model=UploadResponse)
+async def complete_upload(
+    upload_id: uuid.UUID,
+    db: TenantDB,
+    principal: Annotated[Principal, Depends(require_permission("emissions:write"))],
+) -> Upload:
+    """Register a presigned upload's object and queue it for processing."""
+    # RLS hides other companies' uploads, so they are simply not found.  The
+    # row lock makes a concurrent completion wait, then see it is queued.
+    upload = await db.get(Upload, upload_id, with_for_update=True)
+    if upload is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found.",
+        )
+    if upload.status != UPLOAD_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload is already {upload.status}.",
+        )
+
+    try:
+        head = await s3_service.head_object(upload.s3_key)
+    except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError):
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Could not reach file storage. Try again later.",
+        )
+    if head is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The file has not been uploaded yet.",
+        )
+
+    upload.size_bytes = head["ContentLength"]
+    upload.s3_etag = head.get("ETag", "").strip('"') or None
+    upload.content_type = head.get("ContentType") or upload.content_type
+    max_bytes = settings.presigned_upload_max_bytes
+    if upload.size_bytes > max_bytes:
+        # PUT URLs cannot cap the size up front, so it is enforced here.
+        upload.status = UPLOAD_FAILED
+        upload.error = json.dumps(
+            {"error_count": 1, "errors": [{"row": None, "error": "file too large"}]}
+        )
+        await db.commit()
+        try:
+            await s3_service.delete_object(upload.s3_key)
+        except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError):
+            logger.exception("Deleting oversized upload %s failed", upload.s3_key)
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Files may be at most {max_bytes} bytes.",
+        )
+
+    await enqueue(db, upload)
+    await db.commit()
+    return upload
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 
 # --- Request schemas ---
@@ -11,11 +12,19 @@ class CreateCompanyRequest(BaseModel):
     slug: str  # URL-safe, e.g. "acme-corp"
 
 
+class CreateCompaniesBatchRequest(BaseModel):
+    companies: list[CreateCompanyRequest] = Field(min_length=1, max_length=1000)
+
+
 class ProvisionUserRequest(BaseModel):
     cognito_sub: str
     email: EmailStr
 
 
+class ProvisionUsersBatchRequest(BaseModel):
+    users: list[ProvisionUserRequest] = Field(min_length=1, max_length=500)
+
+
 # --- Response schemas ---
 
 class CompanyResponse(BaseModel):
@@ -27,6 +36,26 @@ class CompanyResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class BatchCompanyResult(BaseModel):
+    slug: str
+    # "conflict": the slug already exists, or repeats an earlier item in the batch.
+    status: Literal["created", "conflict"]
+    company: CompanyResponse | None = None
+
+
+class CreateCompaniesBatchResponse(BaseModel):
+    # One entry per requested company, in request order.
+    results: list[BatchCompanyResult]
+
+
+class CompanyPage(BaseModel):
+    items: list[CompanyResponse]
+    # Opaque; pass back as ?cursor= to fetch the next page.  None on the last page.
+    next_cursor: str | None
+    # Only populated when include_total=true.
+    total: int | None = None
+
+
 class UserResponse(BaseModel):
     id: uuid.UUID
     email: str
@@ -37,3 +66,21 @@ class UserResponse(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class BatchUserResult(BaseModel):
+    cognito_sub: str
+    status: Literal[
+        "created",
+        "duplicate",  # repeats an earlier item in the batch
+        "already_provisioned",
+        "cognito_not_found",
+        "cognito_error",
+    ]
+    user: UserResponse | None = None
+    detail: str | None = None
+
+
+class ProvisionUsersBatchResponse(BaseModel):
+    # One entry per requested user, in request order.
+    results: list[BatchUserResult]
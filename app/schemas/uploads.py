@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+# --- Request schemas ---
+
+class PresignUploadRequest(BaseModel):
+    filename: str = Field(min_length=1, max_length=255)
+    content_type: str | None = Field(default=None, max_length=255)
+    # "put" for API clients, "post" for browser form uploads.
+    method: Literal["put", "post"] = "put"
+    # Expected size, checked against the limit before a URL is issued.
+    size_bytes: int | None = Field(default=None, gt=0)
+
+
+# --- Response schemas ---
+
+class PresignedUploadResponse(BaseModel):
+    upload_id: uuid.UUID
+    method: Literal["put", "post"]
+    url: str
+    # Form fields to send with a POST upload, before the file field.
+    fields: dict[str, str]
+    # Headers to send with a PUT upload.
+    headers: dict[str, str]
+    expires_at: datetime
+
+
+class UploadResponse(BaseModel):
+    id: uuid.UUID
+    filename: str
+    status: str
+    size_bytes: int | None
+    row_count: int | None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,69 @@
+"""Shared plumbing for boto3 clients used from async code.
+
+boto3 is synchronous, and building a client can resolve credentials over
+the network (instance metadata, STS), so both the client and every call
+belong off the event loop.  ``BotoClient`` builds its client lazily on
+its own small thread pool, never asyncio's shared default executor.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+import boto3
+import botocore.config
+
+T = TypeVar("T")
+
+
+class BotoClient:
+    """One boto3 client per process, and the thread pool its calls run on."""
+
+    def __init__(
+        self,
+        service: str,
+        *,
+        max_concurrency: int,
+        config: botocore.config.Config,
+        **client_kwargs: Any,
+    ) -> None:
+        self.service = service
+        self.max_concurrency = max_concurrency
+        self._config = config.merge(
+            botocore.config.Config(max_pool_connections=max_concurrency)
+        )
+        self._client_kwargs = client_kwargs
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def get(self):
+        """The client, built on first use.  Blocking: call from a worker thread."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = boto3.client(
+                        self.service, config=self._config, **self._client_kwargs
+                    )
+        return self._client
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix=self.service,
+            )
+        return self._executor
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "asyncio.Future[T]":
+        """Schedule ``fn(client, *args, **kwargs)`` on the thread pool."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(
+            self._get_executor(), lambda: fn(self.get(), *args, **kwargs)
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
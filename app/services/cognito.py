@@ -0,0 +1,98 @@
+"""Cognito user-pool lookups used by admin provisioning.
+
+Calls run on the client's own thread pool (``app.services.aws``).  botocore
+connect/read timeouts plus an overall per-call timeout, and a global
+concurrency limit, keep a slow Cognito from tying up the API.
+
+Point ``cognito_endpoint_url`` at a local stand-in (e.g. moto or
+cognito-local) to exercise provisioning without AWS.
+"""
+
+import asyncio
+from typing import Any, Callable, TypeVar
+
+import botocore.config
+import botocore.exceptions
+
+from app.config import settings
+from app.services.aws import BotoClient
+
+T = TypeVar("T")
+
+client = BotoClient(
+    "cognito-idp",
+    max_concurrency=settings.cognito_max_concurrency,
+    region_name=settings.cognito_region,
+    endpoint_url=settings.cognito_endpoint_url,
+    config=botocore.config.Config(
+        connect_timeout=settings.cognito_timeout_seconds,
+        read_timeout=settings.cognito_timeout_seconds,
+        retries={"max_attempts": 2, "mode": "standard"},
+    ),
+)
+_semaphore = asyncio.Semaphore(settings.cognito_max_concurrency)
+
+
+async def _call(fn: Callable[..., T], *args: Any) -> T:
+    """Run ``fn(client, *args)`` on the Cognito thread pool.
+
+    Raises ``asyncio.TimeoutError`` if the call exceeds
+    ``cognito_call_timeout_seconds``.  Time queued behind the concurrency
+    limit does not count, so a large batch cannot time itself out.
+    """
+    await _semaphore.acquire()
+    try:
+        future = client.submit(fn, *args)
+    except BaseException:
+        _semaphore.release()
+        raise
+    # The slot is freed when the thread finishes rather than on timeout: a
+    # timed-out call still occupies a worker, and the next call must not
+    # spend its own timeout queued behind it.
+    future.add_done_callback(_release_slot)
+    return await asyncio.wait_for(
+        asyncio.shield(future), timeout=settings.cognito_call_timeout_seconds
+    )
+
+
+def _release_slot(future: asyncio.Future) -> None:
+    _semaphore.release()
+    if not future.cancelled():
+        # Retrieve the outcome of abandoned calls so it is not logged as
+        # never retrieved.
+        future.exception()
+
+
+def _user_exists(client, username: str) -> bool:
+    try:
+        client.admin_get_user(UserPoolId=settings.cognito_user_pool_id, Username=username)
+    except botocore.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] == "UserNotFoundException":
+            return False
+        raise
+    return True
+
+
+async def user_exists(username: str) -> bool:
+    return await _call(_user_exists, username)
+
+
+async def users_exist(usernames: list[str]) -> dict[str, bool | Exception]:
+    """Check many users concurrently, within the shared concurrency limit.
+
+    Maps each username to whether it exists in the user pool, or to the
+    exception raised while checking it.
+    """
+
+    async def check(username: str) -> bool | Exception:
+        try:
+            return await user_exists(username)
+        except (
+            asyncio.TimeoutError,
+            botocore.exceptions.BotoCoreError,
+            botocore.exceptions.ClientError,
+        ) as e:
+            return e
+
+    results = await asyncio.gather(*(check(u) for u in usernames))
+    return dict(zip(usernames, results))
@@ -0,0 +1,146 @@
+"""In-memory index over the emission-factor library.
+
+Every calculated row needs the factor for its (dataset, category, unit,
+region) on the activity date.  The whole ``emission_factors`` table is
+small enough to hold in each worker, so it is loaded into a ``FactorIndex``:
+
+  - a dict keyed on the categorical (dataset, category, unit, region)
+    tuple, i.e. one hash lookup per key;
+  - per key, the effective-date ranges as sorted lists, searched with
+    ``bisect``;
+  - the per-gas factors as one (len(GASES), m + 1) float array in the layout
+    ``app.services.calculation.calculate`` expects.  The extra last column
+    is NaN, so a missing factor (index ``MISSING`` == -1) yields NaN CO2e.
+
+Lookups never touch the database.  A statement-level trigger on
+``emission_factors`` sends ``emission_factors_changed``; each worker then
+rebuilds the index in the background and swaps it in, bumping
+``FactorIndex.version``.  Callers should take one ``factor_store.index``
+for a whole batch so a reload cannot mix two versions.
+"""
+
+import datetime
+import logging
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import groupby
+from types import MappingProxyType
+from typing import Mapping
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models.emissions import EmissionFactor
+from app.notifications import ReloadingStore
+from app.services.calculation import GASES
+
+logger = logging.getLogger(__name__)
+
+EMISSION_FACTORS_CHANNEL = "emission_factors_changed"
+
+MISSING = -1
+
+# (dataset, category, unit, region)
+FactorKey = tuple[str, str, str, str]
+
+_EPOCH = datetime.date(1970, 1, 1)
+_OPEN_END = sys.maxsize
+
+
+def _day(value: datetime.date) -> int:
+    return (value - _EPOCH).days
+
+
+@dataclass(frozen=True, slots=True)
+class _Ranges:
+    """Effective-date ranges of one key, ordered by start day."""
+
+    starts: list[int]
+    ends: list[int]
+    columns: list[int]
+
+
+@dataclass(frozen=True, slots=True)
+class FactorIndex:
+    version: int
+    factors: np.ndarray
+    ranges: Mapping[FactorKey, _Ranges]
+
+    def __len__(self) -> int:
+        # Minus the trailing MISSING column.
+        return self.factors.shape[1] - 1
+
+    def lookup(
+        self, dataset: str, category: str, unit: str, region: str, on: datetime.date
+    ) -> int:
+        """Column of ``factors`` in effect on ``on``, or ``MISSING``."""
+        ranges = self.ranges.get((dataset, category, unit, region))
+        if ranges is None:
+            return MISSING
+        day = _day(on)
+        i = bisect_right(ranges.starts, day) - 1
+        if i < 0 or day >= ranges.ends[i]:
+            return MISSING
+        return ranges.columns[i]
+
+
+async def load_index(db: AsyncSession, version: int = 0) -> FactorIndex:
+    result = await db.execute(
+        select(
+            EmissionFactor.dataset,
+            EmissionFactor.category,
+            EmissionFactor.unit,
+            EmissionFactor.region,
+            EmissionFactor.valid_from,
+            EmissionFactor.valid_to,
+            *(getattr(EmissionFactor, f"{gas}_kg") for gas in GASES),
+        ).order_by(
+            EmissionFactor.dataset,
+            EmissionFactor.category,
+            EmissionFactor.unit,
+            EmissionFactor.region,
+            EmissionFactor.valid_from,
+        )
+    )
+    rows = result.all()
+
+    factors = np.full((len(GASES), len(rows) + 1), np.nan)
+    for column, row in enumerate(rows):
+        factors[:, column] = [float(getattr(row, f"{gas}_kg")) for gas in GASES]
+    factors.flags.writeable = False
+
+    ranges: dict[FactorKey, _Ranges] = {}
+    column = 0
+    for key, group in groupby(rows, key=lambda row: tuple(row[:4])):
+        group = list(group)
+        ranges[key] = _Ranges(
+            starts=[_day(row.valid_from) for row in group],
+            ends=[_OPEN_END if row.valid_to is None else _day(row.valid_to) for row in group],
+            columns=list(range(column, column + len(group))),
+        )
+        column += len(group)
+
+    return FactorIndex(version=version, factors=factors, ranges=MappingProxyType(ranges))
+
+
+class FactorStore(ReloadingStore):
+    description = "emission factor index"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.index: FactorIndex | None = None
+        self._version = 0
+
+    async def load(self) -> FactorIndex:
+        async with AsyncSessionLocal() as db:
+            index = await load_index(db, version=self._version + 1)
+        self._version = index.version
+        self.index = index
+        logger.info("Loaded %d emission factors (version %d)", len(index), index.version)
+        return index
+
+
+factor_store = FactorStore()
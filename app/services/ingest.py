@@ -0,0 +1,423 @@
+"""Streaming ingest of activity-data spreadsheets.
+
+An upload is processed as it arrives:
+
+  1. every chunk of the file is forwarded to S3 (``MultipartWriter``) so the
+     original is kept, one part in memory at a time;
+  2. CSV is parsed incrementally from the same chunks; XLSX cannot be (the
+     zip directory is at the end of the file), so it is spooled to a
+     temporary file and read row by row with openpyxl once complete;
+  3. rows are validated and unit-converted ``upload_batch_rows`` at a time
+     and bulk-loaded with ``COPY``.
+
+Postgres does not allow ``COPY FROM`` into tables with row-level security,
+so each batch is copied into a temporary staging table and moved into
+``activity_records`` with ``INSERT ... SELECT``, which the tenant policy
+checks as usual.  The whole load runs in a savepoint of the caller's tenant
+session: an upload with any invalid row loads nothing.
+"""
+
+import asyncio
+import codecs
+import csv
+import datetime
+import logging
+import math
+import tempfile
+from functools import lru_cache
+from itertools import islice
+from typing import AsyncIterator, Iterator, Literal
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.uploads import UPLOAD_COMPLETED, Upload
+from app.services.calculation import UNIT_CONVERSIONS, factorize
+from app.services.s3 import MultipartWriter
+
+logger = logging.getLogger(__name__)
+
+UploadFormat = Literal["csv", "xlsx"]
+
+REQUIRED_COLUMNS = ("period", "scope", "category", "quantity", "unit")
+OPTIONAL_COLUMNS = ("description",)
+
+MAX_REPORTED_ERRORS = 100
+# numeric(20, 6) holds values below 10**14.
+MAX_QUANTITY = 1e14
+
+# PostgreSQL SQLSTATE raised when no partition accepts a row.
+CHECK_VIOLATION = "23514"
+
+_STAGING_DDL = """
+CREATE TEMP TABLE activity_upload_staging (
+    period date NOT NULL,
+    scope smallint NOT NULL,
+    category varchar(100) NOT NULL,
+    description text,
+    quantity numeric(20, 6) NOT NULL,
+    unit varchar(32) NOT NULL
+) ON COMMIT DROP
+"""
+_STAGING_COLUMNS = "period, scope, category, description, quantity, unit"
+
+
+class UploadFormatError(ValueError):
+    """The file as a whole cannot be processed (type, encoding, header)."""
+
+
+class UploadRejected(Exception):
+    """One or more rows failed validation; nothing was loaded."""
+
+    def __init__(self, errors: list[dict], error_count: int) -> None:
+        self.errors = errors
+        self.error_count = error_count
+        super().__init__(f"{error_count} invalid rows")
+
+
+def upload_format(filename: str) -> UploadFormat | None:
+    suffix = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return suffix if suffix in ("csv", "xlsx") else None  # type: ignore[return-value]
+
+
+# (row number in the source file, cells); blank rows are skipped.
+NumberedRow = tuple[int, list]
+
+
+class CSVRowParser:
+    """Incremental CSV parser: feed bytes, get back the rows they complete.
+
+    A record ends at a newline outside quotes, which is tracked by quote
+    parity (an escaped ``""`` counts twice), so quoted fields may span
+    chunks and lines.  Each row is numbered with the line it starts on, so
+    errors point at the right place even after blank lines or multi-line
+    fields.
+    """
+
+    def __init__(self) -> None:
+        # utf-8-sig drops the byte-order mark Excel puts on "CSV UTF-8".
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._tail = ""
+        self._record: list[str] = []
+        self._quotes = 0
+        self._line = 0
+        self._record_start = 1
+
+    def feed(self, data: bytes, final: bool = False) -> list[NumberedRow]:
+        try:
+            chunk = self._decoder.decode(data, final)
+        except UnicodeDecodeError as e:
+            raise UploadFormatError("CSV files must be UTF-8 encoded.") from e
+        lines = (self._tail + chunk).split("\n")
+        self._tail = lines.pop()
+        if final and self._tail:
+            lines.append(self._tail)
+            self._tail = ""
+
+        records: list[str] = []
+        starts: list[int] = []
+        for line in lines:
+            self._line += 1
+            if not self._record:
+                self._record_start = self._line
+            self._record.append(line)
+            self._quotes += line.count('"')
+            if self._quotes % 2 == 0:
+                records.append("\n".join(self._record))
+                starts.append(self._record_start)
+                self._record = []
+                self._quotes = 0
+        if final and self._record:
+            raise UploadFormatError("CSV file ends inside a quoted field.")
+
+        rows: list[NumberedRow] = []
+        reader = csv.reader(records)
+        consumed = 0
+        for row in reader:
+            # line_num counts the records the reader has taken so far.
+            start, consumed = starts[consumed], reader.line_num
+            if row:
+                rows.append((start, row))
+        return rows
+
+
+def iter_xlsx_rows(file) -> Iterator[NumberedRow]:
+    """Rows of the first worksheet, read without loading the whole sheet."""
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise UploadFormatError("Not a readable XLSX workbook.") from e
+    try:
+        # Read-only sheets fill in missing rows, so this counts sheet rows.
+        for number, row in enumerate(workbook.worksheets[0].iter_rows(values_only=True), 1):
+            if any(cell is not None and cell != "" for cell in row):
+                yield number, list(row)
+    finally:
+        workbook.close()
+
+
+@lru_cache(maxsize=4096)
+def _parse_period_text(value: str) -> datetime.date:
+    # Files repeat the same few dates; failures are not cached.
+    try:
+        return datetime.date.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"invalid period {value!r}; expected YYYY-MM-DD") from None
+
+
+def _parse_period(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return _parse_period_text(str(value))
+
+
+def _parse_scope(value) -> int:
+    try:
+        scope = int(str(value).strip())
+    except ValueError:
+        scope = 0
+    if scope not in (1, 2, 3):
+        raise ValueError(f"invalid scope {value!r}; expected 1, 2 or 3")
+    return scope
+
+
+def _parse_quantity(value) -> float:
+    try:
+        quantity = float(value if isinstance(value, (int, float)) else str(value).strip())
+    except ValueError:
+        raise ValueError(f"invalid quantity {value!r}") from None
+    if not math.isfinite(quantity) or quantity < 0:
+        raise ValueError(f"invalid quantity {value!r}; expected a non-negative number")
+    return quantity
+
+
+def _parse_text(value, column: str, max_length: int | None, required: bool) -> str | None:
+    value = "" if value is None else str(value).strip()
+    if not value:
+        if required:
+            raise ValueError(f"{column} is required")
+        return None
+    if max_length is not None and len(value) > max_length:
+        raise ValueError(f"{column} is longer than {max_length} characters")
+    return value
+
+
+class ActivityLoader:
+    """Validates, converts and bulk-loads activity rows for one upload."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        upload: Upload,
+        *,
+        batch_rows: int | None = None,
+    ) -> None:
+        self.db = db
+        self.upload = upload
+        self.batch_rows = batch_rows or settings.upload_batch_rows
+        self.row_count = 0
+        self.errors: list[dict] = []
+        self.error_count = 0
+        self._columns: dict[str, int] | None = None
+        self._batch: list[NumberedRow] = []
+        self._staging_ready = False
+
+    def _error(self, row: int | None, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def _set_header(self, row: list) -> None:
+        names = [str(cell).strip().lower() if cell is not None else "" for cell in row]
+        missing = [column for column in REQUIRED_COLUMNS if column not in names]
+        if missing:
+            raise UploadFormatError(f"Missing columns: {', '.join(missing)}.")
+        self._columns = {
+            column: names.index(column)
+            for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+            if column in names
+        }
+
+    async def add(self, rows: list[NumberedRow]) -> None:
+        for row in rows:
+            if self._columns is None:
+                self._set_header(row[1])
+                continue
+            self._batch.append(row)
+            if len(self._batch) >= self.batch_rows:
+                await self._flush()
+
+    async def finish(self) -> None:
+        if self._columns is None:
+            raise UploadFormatError("The file is empty.")
+        await self._flush()
+        if self.error_count:
+            raise UploadRejected(self.errors, self.error_count)
+
+    async def _flush(self) -> None:
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        rows = self._validate(batch)
+        # After the first error keep validating, to report more, but stop loading.
+        if rows and not self.error_count:
+            await self._load(rows)
+
+    def _validate(self, batch: list[NumberedRow]) -> list[tuple]:
+        columns = self._columns
+        assert columns is not None
+        description_at = columns.get("description")
+        # Short rows are padded out to the last column the header names.
+        width = max(columns.values()) + 1
+
+        parsed: list[tuple] = []
+        row_numbers: list[int] = []
+        for number, row in batch:
+            cells = row + [None] * (width - len(row))
+            try:
+                parsed.append(
+                    (
+                        _parse_period(cells[columns["period"]]),
+                        _parse_scope(cells[columns["scope"]]),
+                        _parse_text(cells[columns["category"]], "category", 100, True),
+                        None
+                        if description_at is None
+                        else _parse_text(cells[description_at], "description", None, False),
+                        _parse_quantity(cells[columns["quantity"]]),
+                        _parse_text(cells[columns["unit"]], "unit", 32, True),
+                    )
+                )
+                row_numbers.append(number)
+            except ValueError as e:
+                self._error(number, str(e))
+        if not parsed:
+            return []
+
+        # Unit conversion, once per distinct unit and vectorized over the batch.
+        units, codes = factorize([row[5] for row in parsed])
+        multipliers = np.array(
+            [UNIT_CONVERSIONS[u][1] if u in UNIT_CONVERSIONS else np.nan for u in units]
+        )
+        canonical = [UNIT_CONVERSIONS[u][0] if u in UNIT_CONVERSIONS else None for u in units]
+        quantities = np.array([row[4] for row in parsed]) * multipliers[codes]
+
+        rows: list[tuple] = []
+        for i, row in enumerate(parsed):
+            unit = canonical[codes[i]]
+            if unit is None:
+                self._error(row_numbers[i], f"unknown unit {row[5]!r}")
+                continue
+            quantity = float(quantities[i])
+            if quantity >= MAX_QUANTITY:
+                self._error(row_numbers[i], f"quantity {row[4]!r} {row[5]} is too large")
+                continue
+            rows.append((row[0], row[1], row[2], row[3], quantity, unit))
+        return rows
+
+    async def _load(self, rows: list[tuple]) -> None:
+        if not self._staging_ready:
+            await self.db.execute(text(_STAGING_DDL))
+            self._staging_ready = True
+
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        async with raw.driver_connection.cursor() as cursor:
+            async with cursor.copy(
+                f"COPY activity_upload_staging ({_STAGING_COLUMNS}) FROM STDIN"
+            ) as copy:
+                for row in rows:
+                    await copy.write_row(row)
+
+        try:
+            await self.db.execute(
+                text(
+                    f"INSERT INTO activity_records "
+                    f"(id, company_id, upload_id, {_STAGING_COLUMNS}) "
+                    f"SELECT gen_random_uuid(), :company_id, :upload_id, {_STAGING_COLUMNS} "
+                    f"FROM activity_upload_staging"
+                ).execution_options(batched=True),
+                {"company_id": self.upload.company_id, "upload_id": self.upload.id},
+            )
+        except DBAPIError as e:
+            if getattr(e.orig, "sqlstate", None) != CHECK_VIOLATION:
+                raise
+            # No monthly partition exists for some period in this batch.  The
+            # savepoint is unusable now; finish() rejects the upload.
+            self._error(None, "a period is outside the range accepted for activity data")
+            return
+        await self.db.execute(
+            text("TRUNCATE activity_upload_staging").execution_options(batched=True)
+        )
+        self.row_count += len(rows)
+
+
+async def ingest(
+    db: AsyncSession,
+    upload: Upload,
+    fmt: UploadFormat,
+    chunks: AsyncIterator[bytes],
+) -> None:
+    """Stream ``chunks`` to S3 at ``upload.s3_key`` and load their rows.
+
+    ``upload`` must already be flushed in ``db``, a tenant session.  On
+    success it is marked completed.  ``UploadRejected`` means the file was
+    received and stored in S3, but nothing was loaded; on any other error
+    (including ``UploadFormatError``) the S3 object is discarded as well.
+    """
+    writer = MultipartWriter(upload.s3_key, content_type=upload.content_type)
+    loader = ActivityLoader(db, upload)
+    try:
+        async with db.begin_nested():
+            if fmt == "csv":
+                parser = CSVRowParser()
+                async for chunk in chunks:
+                    await writer.write(chunk)
+                    await loader.add(parser.feed(chunk))
+                await loader.add(parser.feed(b"", final=True))
+            else:
+                await _ingest_xlsx(loader, writer, chunks)
+            upload.size_bytes = writer.size
+            await writer.complete()
+            await loader.finish()
+    except UploadRejected:
+        raise
+    except BaseException:
+        try:
+            await writer.abort()
+        except Exception:
+            logger.exception("Aborting S3 upload %s failed", upload.s3_key)
+        raise
+
+    upload.status = UPLOAD_COMPLETED
+    upload.row_count = loader.row_count
+
+
+async def _ingest_xlsx(
+    loader: ActivityLoader, writer: MultipartWriter, chunks: AsyncIterator[bytes]
+) -> None:
+    with tempfile.SpooledTemporaryFile(max_size=settings.s3_upload_part_size_bytes) as spool:
+        async for chunk in chunks:
+            await writer.write(chunk)
+            spool.write(chunk)
+        spool.seek(0)
+
+        # openpyxl is blocking; pull one batch at a time in a worker thread.
+        rows = iter_xlsx_rows(spool)
+        while True:
+            batch = await asyncio.to_thread(lambda: list(islice(rows, loader.batch_rows)))
+            if not batch:
+                break
+            await loader.add(batch)
+
+
+def error_report(error: UploadRejected | UploadFormatError) -> dict:
+    if isinstance(error, UploadRejected):
+        return {"error_count": error.error_count, "errors": error.errors}
+    return {"error_count": 1, "errors": [{"row": None, "error": str(error)}]}
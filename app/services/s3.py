@@ -0,0 +1,194 @@
+"""S3 access for tenant uploads.
+
+Calls run on the client's own thread pool (``app.services.aws``).  That
+includes presigning: the signature is computed locally, but the first
+use builds the client and may fetch credentials.  Point
+``s3_endpoint_url`` at a local stand-in (MinIO, moto server) to exercise
+uploads without AWS.
+"""
+
+from typing import Any, Callable, TypeVar
+
+import botocore.config
+import botocore.exceptions
+
+from app.config import settings
+from app.services.aws import BotoClient
+
+T = TypeVar("T")
+
+client = BotoClient(
+    "s3",
+    max_concurrency=settings.s3_max_concurrency,
+    region_name=settings.aws_region,
+    endpoint_url=settings.s3_endpoint_url,
+    config=botocore.config.Config(retries={"max_attempts": 3, "mode": "standard"}),
+)
+
+
+async def call(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(client, *args, **kwargs)`` on the S3 thread pool."""
+    return await client.submit(fn, *args, **kwargs)
+
+
+def _presign_put(
+    client, key: str, content_type: str | None, expires_in: int
+) -> tuple[str, dict[str, str]]:
+    params = {"Bucket": settings.s3_bucket_name, "Key": key}
+    headers: dict[str, str] = {}
+    if content_type:
+        params["ContentType"] = content_type
+        headers["Content-Type"] = content_type
+    url = client.generate_presigned_url("put_object", Params=params, ExpiresIn=expires_in)
+    return url, headers
+
+
+async def presign_put(
+    key: str, content_type: str | None, expires_in: int
+) -> tuple[str, dict[str, str]]:
+    """URL for a single PUT of ``key``, and the headers the client must send."""
+    return await call(_presign_put, key, content_type, expires_in)
+
+
+def _presign_post(
+    client, key: str, content_type: str | None, max_bytes: int, expires_in: int
+) -> tuple[str, dict[str, str]]:
+    fields: dict[str, str] = {}
+    conditions: list = [["content-length-range", 1, max_bytes]]
+    if content_type:
+        fields["Content-Type"] = content_type
+        conditions.append({"Content-Type": content_type})
+    response = client.generate_presigned_post(
+        settings.s3_bucket_name,
+        key,
+        Fields=fields,
+        Conditions=conditions,
+        ExpiresIn=expires_in,
+    )
+    return response["url"], response["fields"]
+
+
+async def presign_post(
+    key: str, content_type: str | None, max_bytes: int, expires_in: int
+) -> tuple[str, dict[str, str]]:
+    """URL and form fields for a browser POST of ``key``.
+
+    Unlike PUT, the POST policy lets S3 itself enforce the size limit.
+    """
+    return await call(_presign_post, key, content_type, max_bytes, expires_in)
+
+
+def _head_object(client, key: str) -> dict | None:
+    try:
+        return client.head_object(Bucket=settings.s3_bucket_name, Key=key)
+    except botocore.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+
+async def head_object(key: str) -> dict | None:
+    """Object metadata, or None if ``key`` does not exist."""
+    return await call(_head_object, key)
+
+
+async def delete_object(key: str) -> None:
+    await call(lambda client: client.delete_object(Bucket=settings.s3_bucket_name, Key=key))
+
+
+class MultipartWriter:
+    """Streams an object to S3 without holding more than one part in memory.
+
+    Bytes are buffered up to ``part_size`` and each full part is uploaded
+    before ``write`` returns, which also applies back-pressure to the
+    producer.  Objects smaller than one part are sent with a single
+    ``put_object`` instead.  Call ``complete()`` on success and ``abort()``
+    on failure so S3 discards uploaded parts, or the object itself if it
+    was already completed.  Without a ``content_type`` the object gets S3's
+    default.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        *,
+        content_type: str | None = None,
+        bucket: str | None = None,
+        part_size: int | None = None,
+    ) -> None:
+        self.bucket = bucket or settings.s3_bucket_name
+        self.key = key
+        # Only sent when known; botocore rejects None and S3 would store "".
+        self._content_type = {"ContentType": content_type} if content_type else {}
+        self.part_size = part_size or settings.s3_upload_part_size_bytes
+        self.size = 0
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[dict] = []
+        self._completed = False
+
+    async def write(self, data: bytes) -> None:
+        self._buffer += data
+        self.size += len(data)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            await self._upload_part(part)
+
+    async def _upload_part(self, body: bytes) -> None:
+        if self._upload_id is None:
+            response = await call(
+                lambda client: client.create_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, **self._content_type
+                )
+            )
+            self._upload_id = response["UploadId"]
+        number = len(self._parts) + 1
+        response = await call(
+            lambda client: client.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                PartNumber=number,
+                Body=body,
+            )
+        )
+        self._parts.append({"PartNumber": number, "ETag": response["ETag"]})
+
+    async def complete(self) -> None:
+        if self._upload_id is None:
+            body = bytes(self._buffer)
+            self._buffer.clear()
+            await call(
+                lambda client: client.put_object(
+                    Bucket=self.bucket, Key=self.key, Body=body, **self._content_type
+                )
+            )
+            self._completed = True
+            return
+        if self._buffer:
+            part = bytes(self._buffer)
+            self._buffer.clear()
+            await self._upload_part(part)
+        await call(
+            lambda client: client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        )
+        self._completed = True
+
+    async def abort(self) -> None:
+        self._buffer.clear()
+        if self._completed:
+            await call(
+                lambda client: client.delete_object(Bucket=self.bucket, Key=self.key)
+            )
+        elif self._upload_id is not None:
+            await call(
+                lambda client: client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+                )
+            )
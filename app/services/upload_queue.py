@@ -0,0 +1,21 @@
+"""Postgres-backed queue of uploads awaiting processing.
+
+A queued upload is an ``uploads`` row with status queued.  Enqueueing also
+sends ``upload_queued`` (payload: the upload id) in the same transaction,
+so a processor can wake on commit instead of polling.  Nothing in this
+service consumes the queue: a processor needs a role that bypasses
+row-level security to see every tenant's uploads.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.uploads import UPLOAD_QUEUED, Upload
+
+UPLOAD_QUEUE_CHANNEL = "upload_queued"
+
+
+async def enqueue(db: AsyncSession, upload: Upload) -> None:
+    upload.status = UPLOAD_QUEUED
+    await db.flush()
+    await db.execute(select(func.pg_notify(UPLOAD_QUEUE_CHANNEL, str(upload.id))))
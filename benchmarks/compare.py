@@ -0,0 +1,49 @@
+"""Compare two benchmark result files.
+
+Usage:
+    uv run python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 10]
+
+Exits with status 1 if any benchmark's throughput dropped or p95 latency
+rose by more than ``--threshold`` percent.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _load(path: Path) -> dict[str, dict]:
+    report = json.loads(path.read_text())
+    return {r["name"]: r for r in report["results"]}
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def main(baseline: Path, candidate: Path, threshold: float) -> int:
+    old, new = _load(baseline), _load(candidate)
+    regressions = 0
+    print(f"{'benchmark':45} {'ops/s':>10} {'Δ%':>7} {'p95 ms':>9} {'Δ%':>7}")
+    for name in sorted(old.keys() & new.keys()):
+        throughput = _change(old[name]["ops_per_second"], new[name]["ops_per_second"])
+        p95 = _change(old[name]["p95_ms"], new[name]["p95_ms"])
+        regressed = throughput < -threshold or p95 > threshold
+        regressions += regressed
+        print(
+            f"{name:45} {new[name]['ops_per_second']:10.1f} {throughput:+7.1f}"
+            f" {new[name]['p95_ms']:9.3f} {p95:+7.1f}{'  REGRESSION' if regressed else ''}"
+        )
+    for name in sorted(old.keys() ^ new.keys()):
+        print(f"{name:45} only in {'baseline' if name in old else 'candidate'}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed change in percent.")
+    args = parser.parse_args()
+    sys.exit(main(args.baseline, args.candidate, args.threshold))
@@ -0,0 +1,147 @@
+"""Shared fixtures for the benchmark suite.
+
+Everything is local: an RSA keypair generated per run, a JWKS stand-in
+served over HTTP on 127.0.0.1, and the Postgres at ``DATABASE_URL``
+(docker-compose's by default).  ``configure_environment()`` must run before
+anything under ``app`` is imported, because settings are read at import.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Awaitable, Callable
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+KID = "bench-key"
+BENCH_SLUG_PREFIX = "bench-"
+
+
+def public_jwk(private_key: rsa.RSAPrivateKey, kid: str) -> dict:
+    public = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    return {**public, "kid": kid, "alg": "RS256", "use": "sig"}
+
+
+class JWKSStub:
+    """Serves ``keys`` as a JWKS document on 127.0.0.1 and counts the fetches.
+
+    Without ``keys`` it generates an RSA key published as ``KID``, which
+    ``token()`` signs with.  Also used by tests/test_jwks.py.
+    """
+
+    def __init__(self, keys: list[dict] | None = None) -> None:
+        self.private_key: rsa.RSAPrivateKey | None = None
+        if keys is None:
+            self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            keys = [public_jwk(self.private_key, KID)]
+        self.keys = keys
+        self.fetches = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                stub.fetches += 1
+                body = json.dumps({"keys": stub.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}/.well-known/jwks.json"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def token(self, sub: str, ttl: int = 3600) -> str:
+        assert self.private_key is not None, "token() needs the generated key"
+        now = int(time.time())
+        claims = {"sub": sub, "iat": now, "exp": now + ttl, "token_use": "access"}
+        return jwt.encode(claims, self.private_key, algorithm="RS256", headers={"kid": KID})
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def configure_environment(jwks: JWKSStub) -> None:
+    os.environ["JWKS_URL"] = jwks.url
+    os.environ.setdefault("COGNITO_USER_POOL_ID", "us-east-1_benchmark")
+    os.environ.setdefault("S3_BUCKET_NAME", "emissiontracker-benchmark")
+    # Statement logging would dominate every measurement.
+    os.environ["DB_ECHO"] = "false"
+
+
+@dataclass
+class Result:
+    name: str
+    iterations: int
+    concurrency: int
+    ops_per_second: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def measure(
+    name: str,
+    operation: Callable[[], Awaitable[object]],
+    *,
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 20,
+) -> Result:
+    """Run ``operation`` ``iterations`` times across ``concurrency`` workers."""
+    for _ in range(warmup):
+        await operation()
+
+    latencies: list[float] = []
+    remaining = iterations
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            await operation()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return Result(
+        name=name,
+        iterations=iterations,
+        concurrency=concurrency,
+        ops_per_second=iterations / elapsed,
+        mean_ms=statistics.fmean(latencies) * 1000,
+        p50_ms=_percentile(latencies, 0.50) * 1000,
+        p95_ms=_percentile(latencies, 0.95) * 1000,
+        p99_ms=_percentile(latencies, 0.99) * 1000,
+    )
+
+
+def result_dict(result: Result) -> dict:
+    return asdict(result)
+
+
+def unique_slug() -> str:
+    return f"{BENCH_SLUG_PREFIX}{uuid.uuid4().hex[:12]}"
@@ -0,0 +1,276 @@
+"""Benchmark the auth and tenant request path and the calculation engine.
+
+Usage:
+    uv run python -m benchmarks.run [--scale 1.0] [--only auth] [--output PATH]
+
+Needs the local Postgres from docker-compose, migrated to head.  Every run
+creates its own companies and users (slug prefix ``bench-``), records their
+ids and deletes exactly those afterwards, so it is safe against a shared
+database.  Results are written as JSON to ``benchmarks/results/``
+(named after the commit) for ``benchmarks.compare``.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.harness import (
+    BENCH_SLUG_PREFIX,
+    JWKSStub,
+    Result,
+    configure_environment,
+    measure,
+    result_dict,
+    unique_slug,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+jwks = JWKSStub()
+configure_environment(jwks)
+
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from sqlalchemy import delete  # noqa: E402
+
+from app.auth import cognito  # noqa: E402
+from app.auth.principals import principal_cache  # noqa: E402
+from app.auth.token_cache import VerifiedTokenCache  # noqa: E402
+from app.database import AsyncSessionLocal  # noqa: E402
+from app.dependencies import _load_principal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.tenant import Company, User  # noqa: E402
+from app.services import calculation  # noqa: E402
+
+
+async def _create_fixtures() -> dict:
+    company_id = uuid.uuid4()
+    admin_sub = f"bench-admin-{uuid.uuid4()}"
+    tenant_sub = f"bench-user-{uuid.uuid4()}"
+    async with AsyncSessionLocal() as db:
+        db.add(Company(id=company_id, name="Benchmark Co", slug=unique_slug()))
+        await db.flush()
+        db.add_all(
+            [
+                User(
+                    cognito_sub=admin_sub,
+                    email="bench-admin@example.com",
+                    company_id=company_id,
+                    is_superadmin=True,
+                ),
+                User(cognito_sub=tenant_sub, email="bench-user@example.com", company_id=company_id),
+            ]
+        )
+        await db.commit()
+    return {
+        "company_id": company_id,
+        "admin_sub": admin_sub,
+        "tenant_sub": tenant_sub,
+        # Every company the run creates, including those made through the API.
+        "company_ids": {company_id},
+    }
+
+
+async def _drop_fixtures(fixtures: dict) -> None:
+    # Deleting a company cascades to its users.
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Company).where(Company.id.in_(fixtures["company_ids"])))
+        await db.commit()
+
+
+async def bench_auth(n: int, fixtures: dict) -> list[Result]:
+    token = jwks.token(fixtures["tenant_sub"])
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    results = []
+
+    # Later suites measure with the app's configured cache, so put it back.
+    configured_cache = cognito.token_cache
+    try:
+        cognito.token_cache = None
+        results.append(
+            await measure("auth.verify_token.uncached", lambda: cognito.verify_token(credentials), iterations=n)
+        )
+
+        cognito.token_cache = VerifiedTokenCache(max_size=10_000)
+        results.append(
+            await measure("auth.verify_token.cached", lambda: cognito.verify_token(credentials), iterations=n)
+        )
+    finally:
+        cognito.token_cache = configured_cache
+    return results
+
+
+async def bench_tenant_session(n: int, fixtures: dict) -> list[Result]:
+    sub = fixtures["tenant_sub"]
+
+    async def setup_session(cold: bool) -> None:
+        if cold:
+            principal_cache.invalidate(sub)
+        async with AsyncSessionLocal() as db:
+            await _load_principal(sub, db, activate_tenant=True)
+            await db.commit()
+
+    return [
+        await measure("tenant.session_setup.cold", lambda: setup_session(True), iterations=n),
+        await measure("tenant.session_setup.warm", lambda: setup_session(False), iterations=n),
+    ]
+
+
+async def bench_http(n: int, fixtures: dict) -> list[Result]:
+    headers = {"Authorization": f"Bearer {jwks.token(fixtures['admin_sub'])}"}
+    transport = httpx.ASGITransport(app=app)
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def get(path: str, **params) -> None:
+            response = await client.get(path, headers=headers, params=params)
+            response.raise_for_status()
+            await response.aread()
+
+        async def create_batch() -> None:
+            companies = [{"name": f"Bench {i}", "slug": unique_slug()} for i in range(100)]
+            response = await client.post(
+                "/admin/companies:batch", headers=headers, json={"companies": companies}
+            )
+            response.raise_for_status()
+            fixtures["company_ids"].update(
+                uuid.UUID(result["company"]["id"]) for result in response.json()["results"]
+            )
+
+        results.append(await measure("http.health", lambda: get("/health"), iterations=n))
+        results.append(await measure("http.ready", lambda: get("/ready"), iterations=n // 4))
+        results.append(
+            await measure("http.admin.create_companies_batch_100", create_batch, iterations=n // 20)
+        )
+        results.append(
+            await measure(
+                "http.admin.list_companies",
+                lambda: get("/admin/companies", limit=100, slug_prefix=BENCH_SLUG_PREFIX),
+                iterations=n // 2,
+            )
+        )
+        results.append(
+            await measure(
+                "http.admin.list_companies.concurrent_16",
+                lambda: get("/admin/companies", limit=100, slug_prefix=BENCH_SLUG_PREFIX),
+                iterations=n,
+                concurrency=16,
+            )
+        )
+        results.append(
+            await measure(
+                "http.admin.export_companies",
+                lambda: get("/admin/export/companies"),
+                iterations=n // 20,
+            )
+        )
+    return results
+
+
+async def bench_calculation(n: int, fixtures: dict) -> list[Result]:
+    rng = np.random.default_rng(0)
+    rows, factor_count = 1_000_000, 500
+    quantity = rng.uniform(0, 10_000, rows)
+    factor_index = rng.integers(0, factor_count, rows)
+    factors = rng.uniform(0, 3, (len(calculation.GASES), factor_count))
+    units = rng.choice(list(calculation.UNIT_CONVERSIONS), rows).tolist()
+    _, multiplier = calculation.convert_units(units)
+
+    # Agreement with the scalar reference is checked in tests/test_calculation.py.
+    sample = 10_000
+    factor_rows = [dict(zip(calculation.GASES, column)) for column in factors.T]
+
+    async def vectorized() -> None:
+        calculation.calculate(quantity, factors, factor_index, unit_multiplier=multiplier)
+
+    async def scalar() -> None:
+        calculation.calculate_scalar(
+            quantity[:sample].tolist(),
+            factor_rows,
+            factor_index[:sample].tolist(),
+            unit_multiplier=multiplier[:sample].tolist(),
+        )
+
+    async def convert() -> None:
+        calculation.convert_units(units)
+
+    iterations = max(5, n // 50)
+    return [
+        await measure("calc.co2e.vectorized_1m", vectorized, iterations=iterations, warmup=2),
+        await measure("calc.co2e.scalar_10k", scalar, iterations=iterations, warmup=2),
+        await measure("calc.convert_units_1m", convert, iterations=iterations, warmup=2),
+    ]
+
+
+SUITES = {
+    "auth": bench_auth,
+    "tenant": bench_tenant_session,
+    "http": bench_http,
+    "calc": bench_calculation,
+}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main(scale: float, only: str | None, output: Path | None) -> None:
+    n = max(20, int(1000 * scale))
+    results: list[Result] = []
+    async with app.router.lifespan_context(app):
+        fixtures = await _create_fixtures()
+        try:
+            for name, suite in SUITES.items():
+                if only and only not in name:
+                    continue
+                for result in await suite(n, fixtures):
+                    print(
+                        f"{result.name:45} {result.ops_per_second:10.1f} ops/s"
+                        f"  p50 {result.p50_ms:7.3f} ms  p99 {result.p99_ms:7.3f} ms"
+                    )
+                    results.append(result)
+        finally:
+            await _drop_fixtures(fixtures)
+    jwks.close()
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "results": [result_dict(r) for r in results],
+    }
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"{commit}-{int(time.time())}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for iteration counts.")
+    parser.add_argument("--only", help="Run only suites whose name contains this string.")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/).")
+    args = parser.parse_args()
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(main(args.scale, args.only, args.output))
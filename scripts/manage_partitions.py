@@ -0,0 +1,55 @@
+"""Maintenance script: keep the monthly activity_records partitions rolling.
+
+Usage:
+    uv run python scripts/manage_partitions.py [--ahead N] [--retain-months M]
+
+Creates partitions from the current month through ``--ahead`` months ahead
+(default 12).  Existing partitions are left alone, so it is safe to run
+daily from cron.  With ``--retain-months``, partitions ending before the
+start of that many months ago are dropped, which removes their rows without
+touching any other partition.
+"""
+
+import argparse
+import asyncio
+import sys
+
+if sys.platform == "win32":
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+from sqlalchemy import text
+
+from app.database import AsyncSessionLocal
+
+
+async def manage(ahead: int, retain_months: int | None) -> None:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            text(
+                "SELECT create_activity_record_partitions("
+                "date_trunc('month', now())::date, :months)"
+            ),
+            {"months": ahead + 1},
+        )
+        print(f"Partitions ensured: {len(result.all())}")
+
+        if retain_months is not None:
+            result = await db.execute(
+                text(
+                    "SELECT drop_activity_record_partitions("
+                    "(date_trunc('month', now()) - make_interval(months => :months))::date)"
+                ),
+                {"months": retain_months},
+            )
+            for (name,) in result:
+                print(f"Dropped {name}")
+        await db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ahead", type=int, default=12)
+    parser.add_argument("--retain-months", type=int, default=None)
+    args = parser.parse_args()
+
+    asyncio.run(manage(args.ahead, args.retain_months))
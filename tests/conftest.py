@@ -0,0 +1,43 @@
+"""Shared test setup.
+
+``app.config.settings`` is built when the module is first imported, so
+required settings get test defaults here, before any app module loads.
+
+Tests that use the ``database`` fixture need the PostgreSQL instance at
+``DATABASE_URL``, migrated with ``alembic upgrade head``; they are skipped
+when it is unreachable.
+"""
+
+import os
+
+os.environ.setdefault("COGNITO_USER_POOL_ID", "us-east-1_test")
+os.environ.setdefault("S3_BUCKET_NAME", "test-bucket")
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+async def database():
+    from app.database import engine
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT version_num FROM alembic_version"))
+    except Exception as e:
+        pytest.skip(f"No migrated database at DATABASE_URL: {e}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def api():
+    """An HTTP client bound to the app, without running its lifespan."""
+    from app.main import app
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
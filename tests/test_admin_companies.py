@@ -0,0 +1,125 @@
+"""Company creation (single and batch) and the streaming admin exports."""
+
+import csv
+import io
+import json
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from app.auth.principals import Principal
+from app.database import AsyncSessionLocal
+from app.dependencies import require_superadmin
+from app.main import app
+from app.models.tenant import Company
+from app.services import export
+
+
+@pytest.fixture
+async def slug_prefix(database):
+    """A unique slug prefix for the test; companies using it are deleted afterwards."""
+    prefix = f"test-{uuid.uuid4().hex[:12]}"
+    app.dependency_overrides[require_superadmin] = lambda: Principal(
+        user_id=uuid.uuid4(), company_id=uuid.uuid4(), is_active=True, is_superadmin=True
+    )
+    yield prefix
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Company).where(Company.slug.startswith(prefix)))
+        await db.commit()
+
+
+async def test_duplicate_slug_is_409(api, slug_prefix):
+    body = {"name": "Acme", "slug": f"{slug_prefix}-acme"}
+    created = await api.post("/admin/companies", json=body)
+    assert created.status_code == 201
+    assert created.json()["slug"] == body["slug"]
+
+    response = await api.post("/admin/companies", json={**body, "name": "Acme Again"})
+    assert response.status_code == 409
+    assert body["slug"] in response.json()["detail"]
+
+
+async def test_batch_reports_existing_and_repeated_slugs_as_conflicts(api, slug_prefix):
+    existing, new = f"{slug_prefix}-existing", f"{slug_prefix}-new"
+    response = await api.post("/admin/companies", json={"name": "Existing", "slug": existing})
+    assert response.status_code == 201
+
+    response = await api.post(
+        "/admin/companies:batch",
+        json={
+            "companies": [
+                {"name": "New", "slug": new},
+                {"name": "Existing", "slug": existing},
+                {"name": "New Again", "slug": new},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(r["slug"], r["status"]) for r in results] == [
+        (new, "created"),
+        (existing, "conflict"),
+        (new, "conflict"),
+    ]
+    assert results[0]["company"]["name"] == "New"
+    assert results[1]["company"] is None and results[2]["company"] is None
+
+
+async def create_companies(api, prefix: str, count: int) -> list[str]:
+    slugs = [f"{prefix}-{i:02d}" for i in range(count)]
+    response = await api.post(
+        "/admin/companies:batch",
+        json={"companies": [{"name": f"{prefix} {slug}", "slug": slug} for slug in slugs]},
+    )
+    assert response.status_code == 200
+    return slugs
+
+
+async def test_ndjson_export_streams_every_company(api, slug_prefix, monkeypatch):
+    # A small batch size makes the stream span several cursor fetches.
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    slugs = await create_companies(api, slug_prefix, 5)
+
+    response = await api.get("/admin/export/companies", params={"format": "ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="companies.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    ours = [row for row in rows if row["slug"].startswith(slug_prefix)]
+    assert [row["slug"] for row in ours] == slugs
+    assert set(ours[0]) == {"id", "name", "slug", "created_at"}
+
+
+async def test_csv_export_has_a_header_and_one_row_per_company(api, slug_prefix, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    slugs = await create_companies(api, slug_prefix, 3)
+
+    response = await api.get("/admin/export/companies", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    reader = csv.DictReader(io.StringIO(response.text))
+    assert reader.fieldnames == ["id", "name", "slug", "created_at"]
+    assert [row["slug"] for row in reader if row["slug"].startswith(slug_prefix)] == slugs
+
+
+async def test_users_export(api, slug_prefix):
+    response = await api.get("/admin/export/users", params={"format": "csv"})
+    assert response.status_code == 200
+    assert next(csv.reader(io.StringIO(response.text))) == [
+        "id",
+        "email",
+        "cognito_sub",
+        "company_id",
+        "is_active",
+        "is_superadmin",
+        "created_at",
+    ]
+
+
+async def test_unknown_export_format_is_422(api, slug_prefix):
+    response = await api.get("/admin/export/companies", params={"format": "xml"})
+    assert response.status_code == 422
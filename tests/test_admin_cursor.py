@@ -0,0 +1,40 @@
+"""Keyset cursors for the admin company listing."""
+
+import base64
+import json
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers.admin import _decode_cursor, _encode_cursor
+
+
+def raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+def test_round_trip():
+    company_id = uuid.uuid4()
+    assert _decode_cursor(_encode_cursor("Acme", company_id)) == ("Acme", company_id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        raw_cursor({"name": "Acme"}),
+        raw_cursor(["Acme"]),
+        raw_cursor(["Acme", str(uuid.uuid4()), "extra"]),
+        raw_cursor(["a", 5]),
+        raw_cursor([5, str(uuid.uuid4())]),
+        raw_cursor([None, str(uuid.uuid4())]),
+        raw_cursor(["Acme", "not-a-uuid"]),
+        raw_cursor("Acme"),
+    ],
+)
+def test_malformed_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
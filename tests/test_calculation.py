@@ -0,0 +1,122 @@
+"""Vectorized CO2e calculation, checked against the scalar reference."""
+
+import decimal
+
+import numpy as np
+import pytest
+
+from app.services.calculation import (
+    GASES,
+    UNIT_CONVERSIONS,
+    UnknownUnitError,
+    calculate,
+    calculate_scalar,
+    convert_units,
+)
+
+# Scale of activity_records.co2e_kg.
+STORED_SCALE = decimal.Decimal("0.000001")
+
+
+def stored(value: float) -> decimal.Decimal:
+    """``value`` as the numeric column keeps it (Postgres rounds half away from zero)."""
+    return decimal.Decimal(repr(float(value))).quantize(
+        STORED_SCALE, rounding=decimal.ROUND_HALF_UP
+    )
+
+
+@pytest.fixture
+def batch():
+    rng = np.random.default_rng(0)
+    rows, factor_count = 10_000, 50
+    units = rng.choice(list(UNIT_CONVERSIONS), rows).tolist()
+    return {
+        "quantity": rng.uniform(0, 10_000, rows),
+        "factors": rng.uniform(0, 3, (len(GASES), factor_count)),
+        "factor_index": rng.integers(0, factor_count, rows),
+        "multiplier": convert_units(units)[1],
+    }
+
+
+@pytest.mark.parametrize("gwp_set", ["AR5", "AR6"])
+def test_matches_scalar_reference(batch, gwp_set):
+    result = calculate(
+        batch["quantity"],
+        batch["factors"],
+        batch["factor_index"],
+        unit_multiplier=batch["multiplier"],
+        gwp_set=gwp_set,
+    )
+    expected_per_gas, expected_total = calculate_scalar(
+        batch["quantity"].tolist(),
+        [dict(zip(GASES, column)) for column in batch["factors"].T],
+        batch["factor_index"].tolist(),
+        unit_multiplier=batch["multiplier"].tolist(),
+        gwp_set=gwp_set,
+    )
+
+    # Same operations in the same order, so the results are bit-identical.
+    assert result.total.tolist() == expected_total
+    for g, gas in enumerate(GASES):
+        assert result.per_gas[g].tolist() == [row[gas] for row in expected_per_gas]
+
+
+def test_one_factor_column_per_row_without_index():
+    factors = np.array([[1.0, 2.0], [0.0, 0.0], [0.0, 0.0]])
+    result = calculate(np.array([10.0, 10.0]), factors)
+    assert result.total.tolist() == [10.0, 20.0]
+
+
+def test_convert_units():
+    canonical, multipliers = convert_units(["MWh", "kWh", "t", "gal", "MWh"])
+    assert canonical.tolist() == ["kWh", "kWh", "kg", "L", "kWh"]
+    assert multipliers.tolist() == [1_000.0, 1.0, 1_000.0, 3.785_411_784, 1_000.0]
+
+
+def test_unknown_units_are_reported_together():
+    with pytest.raises(UnknownUnitError) as exc_info:
+        convert_units(["kWh", "furlong", "parsec", "furlong"])
+    assert exc_info.value.units == ["furlong", "parsec"]
+
+
+def test_missing_factor_yields_nan():
+    # A trailing NaN column, as the emission-factor index builds it; index -1
+    # (MISSING) selects it.
+    factors = np.array([[0.5, np.nan], [0.0, np.nan], [0.0, np.nan]])
+    result = calculate(np.array([10.0, 10.0, np.nan]), factors, np.array([0, -1, 0]))
+    assert result.total[0] == 5.0
+    assert np.isnan(result.total[1])
+    assert np.isnan(result.total[2])
+    assert np.isnan(result.gas("co2")[1])
+
+
+def test_gwp_sets():
+    factors = np.array([[0.0], [1.0], [1.0]])
+    ar5 = calculate(np.array([1.0]), factors, np.array([0]), gwp_set="AR5")
+    ar6 = calculate(np.array([1.0]), factors, np.array([0]), gwp_set="AR6")
+    assert ar5.total.tolist() == [28.0 + 265.0]
+    assert ar6.total.tolist() == [29.8 + 273.0]
+
+
+@pytest.mark.parametrize(
+    ("quantity", "unit", "co2_factor", "expected"),
+    [
+        # 3.6 GJ is exactly 1 MWh; the float conversion is off in the 13th digit.
+        (3.6, "GJ", 1.0, "1000.000000"),
+        (1.0, "therm", 0.184, "5.392508"),
+        (12.5, "MWh", 0.000_233_14, "2.914250"),
+        (100.0, "gal", 2.68, "1014.490358"),
+    ],
+)
+def test_rounding_to_the_stored_scale(quantity, unit, co2_factor, expected):
+    _, multiplier = convert_units([unit])
+    factors = np.array([[co2_factor], [0.0], [0.0]])
+    result = calculate(np.array([quantity]), factors, np.array([0]), unit_multiplier=multiplier)
+    assert stored(result.total[0]) == decimal.Decimal(expected)
+
+
+def test_factor_table_shape_is_checked():
+    with pytest.raises(ValueError):
+        calculate(np.array([1.0]), np.ones((2, 1)))
+    with pytest.raises(ValueError):
+        calculate(np.array([1.0, 2.0]), np.ones((len(GASES), 3)))
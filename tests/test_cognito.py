@@ -0,0 +1,29 @@
+"""Cognito calls: per-call timeouts under the shared concurrency limit."""
+
+import asyncio
+
+from app.config import settings
+from app.services import cognito as cognito_service
+from tests.test_provisioning import StubCognito
+
+
+async def test_queueing_behind_the_limit_does_not_count_against_the_timeout(monkeypatch):
+    stub = StubCognito(users={f"user-{i}" for i in range(10)}, delay=0.2)
+    monkeypatch.setattr(cognito_service.client, "_client", stub)
+    monkeypatch.setattr(cognito_service, "_semaphore", asyncio.Semaphore(2))
+    monkeypatch.setattr(settings, "cognito_call_timeout_seconds", 0.5)
+
+    # Ten 0.2 s calls, two at a time: the last ones wait ~0.8 s for a slot.
+    results = await cognito_service.users_exist([f"user-{i}" for i in range(10)])
+
+    assert results == {f"user-{i}": True for i in range(10)}
+
+
+async def test_slow_call_times_out(monkeypatch):
+    stub = StubCognito(users={"slow"}, delay=0.3)
+    monkeypatch.setattr(cognito_service.client, "_client", stub)
+    monkeypatch.setattr(settings, "cognito_call_timeout_seconds", 0.05)
+
+    results = await cognito_service.users_exist(["slow"])
+
+    assert isinstance(results["slow"], asyncio.TimeoutError)
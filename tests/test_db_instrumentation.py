@@ -0,0 +1,112 @@
+"""Per-request statement stats: event hooks, response headers, N+1 and slow logs."""
+
+import logging
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app import db_instrumentation
+from app.auth.principals import Principal
+from app.db_instrumentation import DBInstrumentationMiddleware, RequestDBStats
+from app.dependencies import require_superadmin
+from app.main import app
+
+
+def middleware_client(statements: list[tuple[str, float]], **options) -> httpx.AsyncClient:
+    """A client for an app that only records ``statements`` in the request's stats."""
+
+    async def endpoint(scope, receive, send) -> None:
+        stats = db_instrumentation._current.get()
+        for statement, elapsed in statements:
+            stats.record_statement(statement, elapsed)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    wrapped = DBInstrumentationMiddleware(
+        endpoint,
+        **{
+            "expose_headers": True,
+            "n_plus_one_threshold": 3,
+            "slow_statement_seconds": 0.5,
+            **options,
+        },
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=wrapped), base_url="http://test")
+
+
+async def test_headers_report_totals_and_the_slowest_statement():
+    statements = [("SELECT 1", 0.002), ("SELECT\n  slow", 0.010), ("SELECT 2", 0.001)]
+    async with middleware_client(statements) as client:
+        response = await client.get("/")
+
+    assert response.headers["X-DB-Statements"] == "3"
+    assert response.headers["X-DB-Time-Ms"] == "13.00"
+    assert response.headers["X-DB-Slowest-Ms"] == "10.00"
+    assert response.headers["X-DB-Slowest-Statement"] == "SELECT slow"
+    assert "X-DB-N-Plus-One" not in response.headers
+
+
+async def test_headers_are_left_out_in_production():
+    async with middleware_client([("SELECT 1", 0.001)], expose_headers=False) as client:
+        response = await client.get("/")
+    assert not any(name.lower().startswith("x-db-") for name in response.headers)
+
+
+async def test_repeated_statement_is_flagged(caplog):
+    statements = [("SELECT * FROM users WHERE id = %(id)s", 0.001)] * 3
+    with caplog.at_level(logging.WARNING, logger="app.db_instrumentation"):
+        async with middleware_client(statements) as client:
+            response = await client.get("/loop")
+
+    assert response.headers["X-DB-N-Plus-One"] == "1"
+    assert "Likely N+1: GET /loop ran 3 times" in caplog.text
+
+
+async def test_slow_statement_is_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.db_instrumentation"):
+        async with middleware_client([("SELECT pg_sleep(1)", 0.75)]) as client:
+            await client.get("/slow")
+    assert "Slow statement: GET /slow spent 750.0 ms on: SELECT pg_sleep(1)" in caplog.text
+
+
+def test_batched_statements_are_not_counted_as_repeats():
+    stats = RequestDBStats()
+    for _ in range(10):
+        stats.record_statement("COPY ...", 0.001, batched=True)
+    stats.record_statement("SELECT 1", 0.001)
+    stats.record_statement("SELECT 1", 0.001)
+    assert stats.statements == 12
+    assert stats.repeated_statements(2) == [("SELECT 1", 2)]
+
+
+async def test_failed_statements_leave_no_state_on_the_connection(database):
+    stats = RequestDBStats()
+    token = db_instrumentation._current.set(stats)
+    try:
+        async with database.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(DBAPIError):
+                    await conn.execute(text("SELECT 1 / 0"))
+                await conn.rollback()
+            await conn.execute(text("SELECT 1"))
+            assert "query_start" not in conn.sync_connection.info
+    finally:
+        db_instrumentation._current.reset(token)
+
+    # Only the statement that completed is timed.
+    assert stats.statements == 1
+    assert stats.slowest_statement == "SELECT 1"
+
+
+async def test_app_requests_report_their_statements(api, database):
+    app.dependency_overrides[require_superadmin] = lambda: Principal(
+        user_id=uuid.uuid4(), company_id=uuid.uuid4(), is_active=True, is_superadmin=True
+    )
+    response = await api.get("/admin/companies", params={"limit": 1})
+
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Statements"]) >= 1
+    assert "companies" in response.headers["X-DB-Slowest-Statement"]
@@ -0,0 +1,74 @@
+"""Emission-factor index: keyed, date-ranged lookups over the loaded library."""
+
+import datetime
+import math
+import uuid
+
+import pytest
+from sqlalchemy import delete, insert
+
+from app.database import AsyncSessionLocal
+from app.models.emissions import EmissionFactor
+from app.services.emission_factors import MISSING, load_index
+
+D = datetime.date
+
+
+@pytest.fixture
+async def dataset(database):
+    name = f"test-{uuid.uuid4().hex[:12]}"
+
+    def factor(region, valid_from, valid_to, co2_kg):
+        return {
+            "id": uuid.uuid4(),
+            "dataset": name,
+            "category": "purchased_electricity",
+            "unit": "kWh",
+            "region": region,
+            "valid_from": valid_from,
+            "valid_to": valid_to,
+            "co2_kg": co2_kg,
+            "ch4_kg": 0.0001,
+            "n2o_kg": 0.001,
+        }
+
+    rows = [
+        # GB: two consecutive years, a gap, then open-ended.
+        factor("GB", D(2022, 1, 1), D(2023, 1, 1), 0.19),
+        factor("GB", D(2023, 1, 1), D(2024, 1, 1), 0.21),
+        factor("GB", D(2025, 1, 1), None, 0.18),
+        factor("FR", D(2022, 1, 1), None, 0.05),
+    ]
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(EmissionFactor), rows)
+        await db.commit()
+    yield name
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(EmissionFactor).where(EmissionFactor.dataset == name))
+        await db.commit()
+
+
+async def test_lookup(dataset):
+    async with AsyncSessionLocal() as db:
+        index = await load_index(db)
+
+    def co2(region: str, on: datetime.date) -> float | None:
+        column = index.lookup(dataset, "purchased_electricity", "kWh", region, on)
+        return None if column == MISSING else float(index.factors[0, column])
+
+    assert co2("GB", D(2022, 6, 1)) == 0.19
+    # valid_to is exclusive.
+    assert co2("GB", D(2023, 1, 1)) == 0.21
+    assert co2("GB", D(2024, 6, 1)) is None
+    assert co2("GB", D(2021, 12, 31)) is None
+    assert co2("GB", D(2099, 1, 1)) == 0.18
+    assert co2("FR", D(2030, 1, 1)) == 0.05
+    assert co2("DE", D(2023, 1, 1)) is None
+    assert index.lookup(dataset, "purchased_electricity", "MWh", "GB", D(2023, 1, 1)) == MISSING
+
+
+async def test_missing_column_is_nan(dataset):
+    async with AsyncSessionLocal() as db:
+        index = await load_index(db)
+    assert all(math.isnan(value) for value in index.factors[:, MISSING])
+    assert not index.factors.flags.writeable
@@ -0,0 +1,109 @@
+"""Incremental CSV/XLSX parsing and the row numbers validation errors report."""
+
+import io
+
+import pytest
+from openpyxl import Workbook
+
+from app.services.ingest import (
+    ActivityLoader,
+    CSVRowParser,
+    UploadFormatError,
+    UploadRejected,
+    iter_xlsx_rows,
+)
+
+HEADER = "period,scope,category,quantity,unit\n"
+
+
+def parse(data: bytes, chunk_size: int) -> list[tuple[int, list[str]]]:
+    parser = CSVRowParser()
+    rows = []
+    for start in range(0, len(data), chunk_size):
+        rows += parser.feed(data[start : start + chunk_size])
+    return rows + parser.feed(b"", final=True)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 16])
+def test_csv_rows_are_the_same_for_any_chunking(chunk_size):
+    data = (
+        "\ufeffperiod,category,description\r\n"
+        '2024-01-01,Électricité,"multi\r\nline, with ""quotes"""\r\n'
+        "\r\n"
+        "2024-02-01,Gas,plain\r\n"
+    ).encode()
+
+    assert parse(data, chunk_size) == [
+        (1, ["period", "category", "description"]),
+        (2, ["2024-01-01", "Électricité", 'multi\r\nline, with "quotes"']),
+        (5, ["2024-02-01", "Gas", "plain"]),
+    ]
+
+
+def test_csv_last_row_without_newline():
+    assert parse(b"a,b\nc,d", 3) == [(1, ["a", "b"]), (2, ["c", "d"])]
+
+
+def test_csv_row_numbers_count_blank_and_continued_lines():
+    data = b'h\n\n\n"one\ntwo\nthree"\nnext\n'
+    assert parse(data, 4) == [(1, ["h"]), (4, ["one\ntwo\nthree"]), (7, ["next"])]
+
+
+def test_csv_unterminated_quote_is_a_format_error():
+    parser = CSVRowParser()
+    assert parser.feed(b'a,"b\nc\n') == []
+    with pytest.raises(UploadFormatError):
+        parser.feed(b"", final=True)
+
+
+def test_csv_invalid_utf8_is_a_format_error():
+    with pytest.raises(UploadFormatError):
+        CSVRowParser().feed(b"\xff\xfe,a\n", final=True)
+
+
+def test_xlsx_rows_are_numbered_by_sheet_row():
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["period", "scope"])
+    sheet.append(["2024-01-01", 1])
+    sheet["A5"] = "2024-02-01"
+    file = io.BytesIO()
+    workbook.save(file)
+    file.seek(0)
+
+    assert list(iter_xlsx_rows(file)) == [
+        (1, ["period", "scope"]),
+        (2, ["2024-01-01", 1]),
+        (5, ["2024-02-01", None]),
+    ]
+
+
+@pytest.mark.parametrize("batch_rows", [1, 2, 100])
+async def test_errors_report_source_rows(batch_rows):
+    data = (
+        HEADER
+        + "2024-13-01,1,Fuel,10,kWh\n"
+        + "\n"
+        + '2024-01-01,4,"Fuel\nfor the\nfleet",10,kWh\n'
+        + "2024-01-01,1,Fuel,-1,kWh\n"
+        + "\n"
+        + "2024-01-01,1,Fuel,10,furlong\n"
+    ).encode()
+    # Every row is invalid, so nothing is loaded and no session is needed.
+    loader = ActivityLoader(None, None, batch_rows=batch_rows)
+    await loader.add(parse(data, 5))
+
+    with pytest.raises(UploadRejected) as exc_info:
+        await loader.finish()
+    assert [error["row"] for error in exc_info.value.errors] == [2, 4, 7, 9]
+    assert exc_info.value.error_count == 4
+
+
+async def test_short_rows_under_a_wide_header_are_row_errors():
+    loader = ActivityLoader(None, None)
+    await loader.add([(1, list("abcdefgh") + HEADER.strip().split(","))])
+    await loader.add([(2, ["x"])])
+
+    with pytest.raises(UploadRejected) as exc_info:
+        await loader.finish()
+    assert [error["row"] for error in exc_info.value.errors] == [2]
@@ -0,0 +1,129 @@
+"""JWKSStore against a stub JWKS endpoint, and token verification on top of it."""
+
+import asyncio
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.auth import cognito
+from app.auth.jwks import JWKSStore
+from benchmarks.harness import JWKSStub, public_jwk
+
+KEY_A = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+KEY_B = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def make_token(private_key: rsa.RSAPrivateKey, kid: str, **claims) -> str:
+    payload = {"sub": "user-1", "exp": int(time.time()) + 300, **claims}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def jwks_server():
+    server = JWKSStub([public_jwk(KEY_A, "a")])
+    yield server
+    server.close()
+
+
+def make_store(
+    server: JWKSStub, *, ttl: float = 3600.0, min_refetch_interval: float = 0.0
+) -> JWKSStore:
+    return JWKSStore(
+        server.url,
+        ttl=ttl,
+        min_refetch_interval=min_refetch_interval,
+        fetch_timeout=5.0,
+    )
+
+
+async def test_background_refresh_after_ttl(jwks_server):
+    # On-demand refetches are effectively disabled, so only the background
+    # task can pick up the rotated key set.
+    store = make_store(jwks_server, ttl=0.05, min_refetch_interval=3600.0)
+    await store.start()
+    try:
+        assert await store.get_key("a") is not None
+        jwks_server.keys = [public_jwk(KEY_B, "b")]
+        await asyncio.sleep(0.3)
+        assert jwks_server.fetches >= 2
+        assert await store.get_key("b") is not None
+        assert await store.get_key("a") is None
+    finally:
+        await store.stop()
+
+
+async def test_unknown_kid_triggers_refetch(jwks_server):
+    store = make_store(jwks_server)
+    await store.refresh()
+    jwks_server.keys = [public_jwk(KEY_A, "a"), public_jwk(KEY_B, "b")]
+
+    assert await store.get_key("b") is not None
+    assert jwks_server.fetches == 2
+    # Known kids are served from memory.
+    assert await store.get_key("a") is not None
+    assert jwks_server.fetches == 2
+
+
+async def test_unknown_kid_refetch_is_rate_limited(jwks_server):
+    store = make_store(jwks_server, min_refetch_interval=3600.0)
+    await store.refresh()
+    jwks_server.keys = [public_jwk(KEY_B, "b")]
+
+    for kid in ("bogus", "bogus", "b"):
+        assert await store.get_key(kid) is None
+    assert jwks_server.fetches == 1
+
+
+async def test_concurrent_unknown_kid_lookups_share_one_refetch(jwks_server):
+    store = make_store(jwks_server)
+    await store.refresh()
+    jwks_server.keys = [public_jwk(KEY_B, "b")]
+
+    keys = await asyncio.gather(*(store.get_key("b") for _ in range(10)))
+    assert all(key is not None for key in keys)
+    assert jwks_server.fetches == 2
+
+
+@pytest.fixture
+async def verifier(jwks_server, monkeypatch):
+    """Point ``verify_token`` at a store backed by the stub endpoint."""
+    store = make_store(jwks_server, min_refetch_interval=3600.0)
+    await store.refresh()
+    monkeypatch.setattr(cognito, "jwks_store", store)
+    monkeypatch.setattr(cognito, "token_cache", None)
+
+    async def verify(token: str) -> dict:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        return await cognito.verify_token(credentials)
+
+    return verify
+
+
+async def test_valid_token_is_accepted(verifier):
+    claims = await verifier(make_token(KEY_A, "a"))
+    assert claims["sub"] == "user-1"
+
+
+async def test_unknown_kid_is_rejected(verifier):
+    with pytest.raises(HTTPException) as exc_info:
+        await verifier(make_token(KEY_B, "b"))
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Public key not found"
+
+
+async def test_bad_signature_is_rejected(verifier):
+    # Signed with B's private key but claiming A's kid.
+    with pytest.raises(HTTPException) as exc_info:
+        await verifier(make_token(KEY_B, "a"))
+    assert exc_info.value.status_code == 401
+
+
+async def test_expired_token_is_rejected(verifier):
+    with pytest.raises(HTTPException) as exc_info:
+        await verifier(make_token(KEY_A, "a", exp=int(time.time()) - 60))
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Token expired"
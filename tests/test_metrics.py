@@ -0,0 +1,71 @@
+"""The /metrics scrape endpoint: token protection and Prometheus output."""
+
+import pytest
+
+from app.config import settings
+from app.metrics import Registry, merge, render
+
+TOKEN = "scrape-token"
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", TOKEN)
+
+
+async def test_disabled_without_a_token(api, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", None)
+    response = await api.get("/metrics", headers={"Authorization": f"Bearer {TOKEN}"})
+    assert response.status_code == 404
+
+
+@pytest.mark.usefixtures("metrics_token")
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", f"Basic {TOKEN}", TOKEN])
+async def test_wrong_or_missing_token_is_401(api, authorization):
+    headers = {"Authorization": authorization} if authorization else {}
+    response = await api.get("/metrics", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.usefixtures("metrics_token")
+async def test_scrape_reports_requests_by_route_template(api):
+    await api.get("/health")
+    await api.get("/no/such/route")
+
+    response = await api.get("/metrics", headers={"Authorization": f"Bearer {TOKEN}"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert "# TYPE http_request_duration_seconds histogram" in lines
+    assert any(
+        line.startswith('http_requests_total{method="GET",route="/health",status="200"} ')
+        for line in lines
+    )
+    assert any(
+        line.startswith('http_requests_total{method="GET",route="<unmatched>",status="404"} ')
+        for line in lines
+    )
+    assert any(line.startswith("db_pool_checked_out ") for line in lines)
+
+
+def test_render_and_merge_histograms():
+    registry = Registry()
+    latency = registry.histogram(
+        "latency_seconds", "Latency.", labelnames=("route",), buckets=(0.1, 1.0)
+    )
+    latency.labels("/a").observe(0.05)
+    latency.labels("/a").observe(0.5)
+    snapshot = registry.snapshot()
+
+    text = render(merge([snapshot, snapshot]))
+
+    assert text.splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 4',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 1.1',
+        'latency_seconds_count{route="/a"} 4',
+    ]
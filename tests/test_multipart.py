@@ -0,0 +1,106 @@
+"""MultipartStream over request bodies delivered in arbitrary chunks."""
+
+import pytest
+from starlette.requests import Request
+
+from app.multipart import FilePart, MultipartError, MultipartStream
+
+BOUNDARY = "xYzZy"
+
+
+def multipart_body(*parts: tuple[dict[str, str], bytes]) -> bytes:
+    body = b""
+    for headers, data in parts:
+        body += f"--{BOUNDARY}\r\n".encode()
+        for name, value in headers.items():
+            body += f"{name}: {value}\r\n".encode()
+        body += b"\r\n" + data + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def make_request(
+    body: bytes,
+    chunk_size: int,
+    content_type: str = f"multipart/form-data; boundary={BOUNDARY}",
+) -> Request:
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive() -> dict:
+        return messages.pop(0)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [(b"content-type", content_type.encode())],
+    }
+    return Request(scope, receive)
+
+
+def text_field(name: str, value: str) -> tuple[dict[str, str], bytes]:
+    return {"Content-Disposition": f'form-data; name="{name}"'}, value.encode()
+
+
+def file_field(
+    name: str, filename: str, data: bytes, content_type: str | None = None
+) -> tuple[dict[str, str], bytes]:
+    headers = {"Content-Disposition": f'form-data; name="{name}"; filename="{filename}"'}
+    if content_type:
+        headers["Content-Type"] = content_type
+    return headers, data
+
+
+async def read_file(stream: MultipartStream) -> bytes:
+    return b"".join([chunk async for chunk in stream.iter_data()])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 1 << 16])
+async def test_file_part_after_other_fields(chunk_size):
+    data = b"period,scope\r\n" + bytes(range(256)) * 4 + b"\r\n--not-the-boundary"
+    body = multipart_body(
+        text_field("note", "ignored"),
+        file_field("other", "other.csv", b"not this one"),
+        file_field("file", "activity.csv", data, "text/csv"),
+    )
+    stream = MultipartStream(make_request(body, chunk_size))
+
+    part = await stream.next_file("file")
+    assert part == FilePart(field="file", filename="activity.csv", content_type="text/csv")
+    assert await read_file(stream) == data
+    assert await stream.next_file("file") is None
+
+
+@pytest.mark.parametrize(
+    "filename", ["activity.csv", "C:\\Users\\me\\activity.csv", "../../activity.csv"]
+)
+async def test_filename_is_reduced_to_its_basename(filename):
+    body = multipart_body(file_field("file", filename, b"x"))
+    part = await MultipartStream(make_request(body, 16)).next_file("file")
+    assert part is not None
+    assert part.filename == "activity.csv"
+    assert part.content_type is None
+
+
+async def test_missing_file_part():
+    body = multipart_body(text_field("file", "not a file"))
+    assert await MultipartStream(make_request(body, 16)).next_file("file") is None
+
+
+async def test_truncated_body_is_an_error():
+    body = multipart_body(file_field("file", "activity.csv", b"a,b\n" * 100))
+    stream = MultipartStream(make_request(body[:-40], 16))
+    await stream.next_file("file")
+    with pytest.raises(MultipartError):
+        await read_file(stream)
+
+
+@pytest.mark.parametrize(
+    "content_type", ["application/json", "multipart/form-data", "text/csv; boundary=x"]
+)
+def test_non_multipart_body_is_rejected(content_type):
+    with pytest.raises(MultipartError):
+        MultipartStream(make_request(b"", 16, content_type))
@@ -0,0 +1,95 @@
+"""ReloadingStore, and the statement-level triggers that drive the stores."""
+
+import asyncio
+
+import psycopg
+import pytest
+from sqlalchemy import text
+
+from app.notifications import ReloadingStore, notification_listener
+
+
+class CountingStore(ReloadingStore):
+    description = "test snapshot"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.loads = 0
+        self.snapshot: int | None = None
+        self.release = asyncio.Event()
+        self.fail = False
+
+    async def load(self) -> int:
+        self.loads += 1
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("load failed")
+        self.snapshot = self.loads
+        return self.snapshot
+
+
+async def test_notification_burst_is_coalesced():
+    store = CountingStore()
+    for _ in range(5):
+        store.handle_notification(None)
+    await asyncio.sleep(0)
+    assert store.loads == 1
+    # Arrives while the first reload is in flight.
+    store.handle_notification(None)
+    store.release.set()
+    await store._reload_task
+    assert store.loads == 2
+    assert store.snapshot == 2
+
+
+async def test_failed_reload_keeps_previous_snapshot():
+    store = CountingStore()
+    store.release.set()
+    await store.start()
+    assert store.snapshot == 1
+
+    store.fail = True
+    store.handle_notification(None)
+    await store._reload_task
+    assert store.snapshot == 1
+
+
+async def test_failed_start_is_logged_not_raised(caplog):
+    store = CountingStore()
+    store.release.set()
+    store.fail = True
+    await store.start()
+    assert store.snapshot is None
+    assert "Initial test snapshot load failed" in caplog.text
+
+
+async def test_stop_cancels_reload_in_flight():
+    store = CountingStore()
+    store.handle_notification(None)
+    await asyncio.sleep(0)
+    await store.stop()
+    assert store._reload_task is None
+
+
+@pytest.mark.parametrize(
+    ("table", "channel"),
+    [
+        ("permissions", "permission_catalogue_changed"),
+        ("emission_factors", "emission_factors_changed"),
+    ],
+)
+async def test_table_change_notifies_channel(database, table, channel):
+    async with await psycopg.AsyncConnection.connect(
+        notification_listener.conninfo, autocommit=True
+    ) as listener:
+        await listener.execute(f"LISTEN {channel}")
+        # Statement-level triggers fire even when no row matches.
+        async with database.begin() as conn:
+            await conn.execute(text(f"DELETE FROM {table} WHERE false"))
+        notifies = listener.notifies(timeout=5.0)
+        try:
+            message = await anext(notifies)
+        finally:
+            await notifies.aclose()
+    assert message.channel == channel
+    assert message.payload == ""
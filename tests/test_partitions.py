@@ -0,0 +1,126 @@
+"""Monthly activity_records partitions: the maintenance functions and per-partition RLS.
+
+Everything runs in one transaction that is rolled back, so the partitions,
+companies and role the tests create never outlive them.  The RLS checks
+switch to a throwaway role: the test database connects as a superuser,
+which bypasses row-level security even when it is forced.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+JANUARY, FEBRUARY = "activity_records_p219901", "activity_records_p219902"
+
+
+@pytest.fixture
+async def conn(database):
+    async with database.connect() as connection:
+        await connection.begin()
+        yield connection
+        await connection.rollback()
+
+
+async def test_partition_creation_is_idempotent(conn):
+    create = text("SELECT create_activity_record_partition(:month)")
+    assert await conn.scalar(create, {"month": "2199-01-17"}) == JANUARY
+    assert await conn.scalar(create, {"month": "2199-01-01"}) == JANUARY
+
+    names = await conn.scalars(
+        text("SELECT create_activity_record_partitions('2198-12-01', 3)")
+    )
+    assert list(names) == ["activity_records_p219812", JANUARY, FEBRUARY]
+    bounds = await conn.scalar(
+        text("SELECT pg_get_expr(relpartbound, oid) FROM pg_class WHERE relname = :name"),
+        {"name": FEBRUARY},
+    )
+    assert bounds == "FOR VALUES FROM ('2199-02-01') TO ('2199-03-01')"
+
+
+async def test_new_partitions_force_rls_with_the_tenant_policy(conn):
+    await conn.execute(text("SELECT create_activity_record_partition('2199-01-01')"))
+
+    enabled, forced = (
+        await conn.execute(
+            text(
+                "SELECT relrowsecurity, relforcerowsecurity FROM pg_class WHERE relname = :name"
+            ),
+            {"name": JANUARY},
+        )
+    ).one()
+    assert enabled and forced
+    policies = await conn.execute(
+        text("SELECT policyname, qual, with_check FROM pg_policies WHERE tablename = :name"),
+        {"name": JANUARY},
+    )
+    [(name, using, check)] = policies.all()
+    assert name == "tenant_isolation"
+    assert "app.current_company_id" in using and using == check
+
+
+async def test_drop_removes_only_partitions_that_have_ended(conn):
+    await conn.execute(text("SELECT create_activity_record_partitions('2199-01-01', 2)"))
+
+    dropped = list(
+        await conn.scalars(text("SELECT drop_activity_record_partitions('2199-02-15')"))
+    )
+
+    assert JANUARY in dropped and FEBRUARY not in dropped
+    assert await conn.scalar(text("SELECT to_regclass(:name)"), {"name": JANUARY}) is None
+    assert await conn.scalar(text("SELECT to_regclass(:name)::text"), {"name": FEBRUARY})
+
+
+async def as_tenant(conn, role: str, company_id: uuid.UUID) -> None:
+    await conn.execute(text(f'SET LOCAL ROLE "{role}"'))
+    await conn.execute(
+        text("SELECT set_config('app.current_company_id', :id, true)"), {"id": str(company_id)}
+    )
+
+
+async def insert_record(
+    conn, company_id: uuid.UUID, category: str, table: str = "activity_records"
+) -> None:
+    await conn.execute(
+        text(
+            f"INSERT INTO {table} (id, company_id, period, scope, category, quantity, unit)"
+            " VALUES (:id, :company_id, '2199-01-01', 1, :category, 1, 'kWh')"
+        ),
+        {"id": uuid.uuid4(), "company_id": company_id, "category": category},
+    )
+
+
+async def test_partitions_isolate_tenants_for_a_role_without_bypassrls(conn):
+    ours, theirs = uuid.uuid4(), uuid.uuid4()
+    for company_id in (ours, theirs):
+        await conn.execute(
+            text("INSERT INTO companies (id, name, slug) VALUES (:id, 'RLS', :slug)"),
+            {"id": company_id, "slug": f"test-{company_id}"},
+        )
+    await conn.execute(text("SELECT create_activity_record_partition('2199-01-01')"))
+    await insert_record(conn, ours, "ours")
+    await insert_record(conn, theirs, "theirs")
+
+    role = f"test_tenant_{uuid.uuid4().hex[:12]}"
+    await conn.execute(text(f'CREATE ROLE "{role}" NOLOGIN NOSUPERUSER NOBYPASSRLS'))
+    await conn.execute(text(f'GRANT USAGE ON SCHEMA public TO "{role}"'))
+    await conn.execute(text(f'GRANT SELECT, INSERT ON activity_records, {JANUARY} TO "{role}"'))
+    await as_tenant(conn, role, ours)
+
+    bypasses = text("SELECT rolsuper OR rolbypassrls FROM pg_roles WHERE rolname = current_user")
+    assert await conn.scalar(bypasses) is False
+
+    for table in ("activity_records", JANUARY):
+        await insert_record(conn, ours, f"ours via {table}", table)
+        categories = await conn.scalars(
+            text(f"SELECT category FROM {table} WHERE period = '2199-01-01' ORDER BY category")
+        )
+        assert "theirs" not in list(categories)
+
+        with pytest.raises(DBAPIError, match="row-level security"):
+            async with conn.begin_nested():
+                await insert_record(conn, theirs, "cross-tenant", table)
+
+    categories = await conn.scalars(text(f"SELECT category FROM {JANUARY} ORDER BY category"))
+    assert list(categories) == ["ours", "ours via activity_records", f"ours via {JANUARY}"]
@@ -0,0 +1,75 @@
+"""PermissionResolver caching and invalidation, without a database."""
+
+import uuid
+
+from app.auth.catalogue import PermissionCatalogue
+from app.auth.permissions import PermissionResolver
+
+READ, WRITE = uuid.uuid4(), uuid.uuid4()
+CATALOGUE = PermissionCatalogue.from_rows([(READ, "emissions:read"), (WRITE, "emissions:write")])
+COMPANY, USER = uuid.uuid4(), uuid.uuid4()
+
+
+class FakeCatalogues:
+    def on_reload(self, listener) -> None:
+        pass
+
+    async def get(self, db) -> PermissionCatalogue:
+        return CATALOGUE
+
+
+class FakeResult:
+    def __init__(self, ids) -> None:
+        self._ids = ids
+
+    def scalars(self):
+        return iter(self._ids)
+
+
+class FakeDB:
+    """Answers the permission query with ``granted``; counts the queries."""
+
+    def __init__(self, granted, during_query=None) -> None:
+        self.granted = granted
+        self.during_query = during_query
+        self.queries = 0
+
+    async def execute(self, stmt) -> FakeResult:
+        self.queries += 1
+        if self.during_query is not None:
+            self.during_query()
+        return FakeResult(list(self.granted))
+
+
+def make_resolver() -> PermissionResolver:
+    return PermissionResolver(FakeCatalogues(), ttl=60.0, max_size=100)
+
+
+async def test_warm_cache_skips_the_query():
+    resolver = make_resolver()
+    db = FakeDB({READ})
+    assert await resolver.has_permission(db, COMPANY, USER, "emissions:read")
+    assert not await resolver.has_permission(db, COMPANY, USER, "emissions:write")
+    assert db.queries == 1
+
+
+async def test_company_invalidation_forces_a_reload():
+    resolver = make_resolver()
+    db = FakeDB({READ})
+    assert await resolver.has_permission(db, COMPANY, USER, "emissions:read")
+    resolver.invalidate_company(COMPANY)
+    db.granted = set()
+    assert not await resolver.has_permission(db, COMPANY, USER, "emissions:read")
+    assert db.queries == 2
+
+
+async def test_set_loaded_across_a_clear_is_not_served():
+    resolver = make_resolver()
+    # The listener reconnects (clear()) while the first lookup is in flight.
+    db = FakeDB({READ}, during_query=lambda: resolver.handle_notification(None))
+    await resolver.has_permission(db, COMPANY, USER, "emissions:read")
+    db.during_query = None
+    await resolver.has_permission(db, COMPANY, USER, "emissions:read")
+    assert db.queries == 2
+    await resolver.has_permission(db, COMPANY, USER, "emissions:read")
+    assert db.queries == 2
@@ -0,0 +1,39 @@
+"""PrincipalCache: invalidations racing a lookup must not re-cache stale rows."""
+
+import uuid
+
+from app.auth.principals import Principal, PrincipalCache
+
+PRINCIPAL = Principal(
+    user_id=uuid.uuid4(), company_id=uuid.uuid4(), is_active=True, is_superadmin=False
+)
+
+
+def test_put_then_get():
+    cache = PrincipalCache(ttl=60.0, max_size=10)
+    cache.put("sub", PRINCIPAL, cache.generation("sub"))
+    assert cache.get("sub") == PRINCIPAL
+
+
+def test_put_is_dropped_after_invalidation_of_the_sub():
+    cache = PrincipalCache(ttl=60.0, max_size=10)
+    generation = cache.generation("sub")
+    cache.invalidate("sub")  # arrives while the lookup is in flight
+    cache.put("sub", PRINCIPAL, generation)
+    assert cache.get("sub") is None
+
+
+def test_put_is_dropped_after_clear():
+    cache = PrincipalCache(ttl=60.0, max_size=10)
+    generation = cache.generation("sub")
+    cache.handle_notification(None)
+    cache.put("sub", PRINCIPAL, generation)
+    assert cache.get("sub") is None
+
+
+def test_invalidating_another_sub_does_not_drop_put():
+    cache = PrincipalCache(ttl=60.0, max_size=10)
+    generation = cache.generation("sub")
+    cache.invalidate("other")
+    cache.put("sub", PRINCIPAL, generation)
+    assert cache.get("sub") == PRINCIPAL
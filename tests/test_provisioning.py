@@ -0,0 +1,208 @@
+"""User provisioning through the admin API, against a stubbed Cognito client."""
+
+import time
+import uuid
+
+import botocore.exceptions
+import pytest
+from sqlalchemy import delete, insert
+
+from app.auth.principals import Principal
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.dependencies import require_superadmin
+from app.main import app
+from app.models.tenant import Company, User
+from app.services import cognito as cognito_service
+
+
+class StubCognito:
+    """Stands in for the boto3 ``cognito-idp`` client."""
+
+    def __init__(self, users: set[str], delay: float = 0.0) -> None:
+        self.users = users
+        self.delay = delay
+        self.error: Exception | None = None
+        self.calls = 0
+
+    def admin_get_user(self, *, UserPoolId: str, Username: str) -> dict:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        if Username not in self.users:
+            raise botocore.exceptions.ClientError(
+                {"Error": {"Code": "UserNotFoundException", "Message": "User does not exist."}},
+                "AdminGetUser",
+            )
+        return {"Username": Username}
+
+
+@pytest.fixture
+def cognito(monkeypatch):
+    stub = StubCognito(users=set())
+    monkeypatch.setattr(cognito_service.client, "_client", stub)
+    return stub
+
+
+@pytest.fixture
+async def company(database):
+    company_id = uuid.uuid4()
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(Company).values(
+                id=company_id, name="Provisioning Test", slug=f"test-{company_id}"
+            )
+        )
+        await db.commit()
+    yield company_id
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(User).where(User.company_id == company_id))
+        await db.execute(delete(Company).where(Company.id == company_id))
+        await db.commit()
+
+
+@pytest.fixture
+def superadmin():
+    app.dependency_overrides[require_superadmin] = lambda: Principal(
+        user_id=uuid.uuid4(), company_id=uuid.uuid4(), is_active=True, is_superadmin=True
+    )
+
+
+def new_sub() -> str:
+    return f"sub-{uuid.uuid4()}"
+
+
+@pytest.mark.usefixtures("superadmin")
+async def test_provision_user(api, cognito, company):
+    sub = new_sub()
+    cognito.users.add(sub)
+
+    response = await api.post(
+        f"/admin/companies/{company}/users",
+        json={"cognito_sub": sub, "email": "user@example.com"},
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["cognito_sub"] == sub
+    assert body["company_id"] == str(company)
+    assert body["is_active"] is True
+
+
+@pytest.mark.usefixtures("superadmin")
+async def test_provision_user_twice_is_409(api, cognito, company):
+    sub = new_sub()
+    cognito.users.add(sub)
+    request = {"cognito_sub": sub, "email": "user@example.com"}
+
+    assert (await api.post(f"/admin/companies/{company}/users", json=request)).status_code == 201
+    response = await api.post(f"/admin/companies/{company}/users", json=request)
+    assert response.status_code == 409
+
+
+@pytest.mark.usefixtures("superadmin")
+async def test_provision_user_unknown_to_cognito_is_404(api, cognito, company):
+    response = await api.post(
+        f"/admin/companies/{company}/users",
+        json={"cognito_sub": new_sub(), "email": "user@example.com"},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.usefixtures("superadmin")
+async def test_provision_user_cognito_timeout_is_504(api, cognito, company, monkeypatch):
+    sub = new_sub()
+    cognito.users.add(sub)
+    cognito.delay = 0.5
+    monkeypatch.setattr(settings, "cognito_call_timeout_seconds", 0.1)
+
+    response = await api.post(
+        f"/admin/companies/{company}/users",
+        json={"cognito_sub": sub, "email": "user@example.com"},
+    )
+    assert response.status_code == 504
+
+
+@pytest.mark.usefixtures("superadmin")
+@pytest.mark.parametrize(
+    ("error", "status_code"),
+    [
+        (botocore.exceptions.ConnectTimeoutError(endpoint_url="https://cognito"), 504),
+        (botocore.exceptions.ReadTimeoutError(endpoint_url="https://cognito"), 504),
+        (botocore.exceptions.EndpointConnectionError(endpoint_url="https://cognito"), 502),
+        (
+            botocore.exceptions.ClientError(
+                {"Error": {"Code": "TooManyRequestsException", "Message": "Slow down."}},
+                "AdminGetUser",
+            ),
+            502,
+        ),
+    ],
+)
+async def test_provision_user_cognito_failure(api, cognito, company, error, status_code):
+    cognito.error = error
+    response = await api.post(
+        f"/admin/companies/{company}/users",
+        json={"cognito_sub": new_sub(), "email": "user@example.com"},
+    )
+    assert response.status_code == status_code
+
+
+@pytest.mark.usefixtures("superadmin")
+async def test_provision_users_batch(api, cognito, company):
+    created, existing, missing = new_sub(), new_sub(), new_sub()
+    cognito.users.update({created, existing})
+    await api.post(
+        f"/admin/companies/{company}/users",
+        json={"cognito_sub": existing, "email": "existing@example.com"},
+    )
+    cognito.calls = 0
+
+    response = await api.post(
+        f"/admin/companies/{company}/users:batch",
+        json={
+            "users": [
+                {"cognito_sub": created, "email": "new@example.com"},
+                {"cognito_sub": created, "email": "again@example.com"},
+                {"cognito_sub": existing, "email": "existing@example.com"},
+                {"cognito_sub": missing, "email": "missing@example.com"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [
+        "created",
+        "duplicate",
+        "already_provisioned",
+        "cognito_not_found",
+    ]
+    assert results[0]["user"]["email"] == "new@example.com"
+    # Already-provisioned and repeated subs are not sent to Cognito.
+    assert cognito.calls == 2
+
+
+@pytest.mark.usefixtures("superadmin")
+async def test_provision_users_batch_cognito_timeout(api, cognito, company, monkeypatch):
+    slow, other = new_sub(), new_sub()
+    cognito.users.update({slow, other})
+    cognito.delay = 0.5
+    monkeypatch.setattr(settings, "cognito_call_timeout_seconds", 0.1)
+
+    response = await api.post(
+        f"/admin/companies/{company}/users:batch",
+        json={
+            "users": [
+                {"cognito_sub": slow, "email": "slow@example.com"},
+                {"cognito_sub": other, "email": "other@example.com"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == [
+        "cognito_error",
+        "cognito_error",
+    ]
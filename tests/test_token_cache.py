@@ -0,0 +1,74 @@
+"""Verified-token cache: entries live until the token's ``exp`` claim."""
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.auth import cognito
+from app.auth import token_cache as token_cache_module
+from app.auth.token_cache import VerifiedTokenCache
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(1_000.0)
+    monkeypatch.setattr(token_cache_module, "time", clock)
+    return clock
+
+
+def test_entry_expires_at_exp(clock):
+    cache = VerifiedTokenCache(max_size=10)
+    cache.put("token", {"sub": "user-1", "exp": 1_060})
+
+    clock.now = 1_059.9
+    assert cache.get("token") == {"sub": "user-1", "exp": 1_060}
+    clock.now = 1_060.0
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_tokens_without_exp_are_not_cached(clock):
+    cache = VerifiedTokenCache(max_size=10)
+    cache.put("token", {"sub": "user-1"})
+    assert cache.get("token") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = VerifiedTokenCache(max_size=2)
+    cache.put("a", {"exp": 2_000})
+    cache.put("b", {"exp": 2_000})
+    cache.get("a")
+    cache.put("c", {"exp": 2_000})
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+class NoKeys:
+    async def get_key(self, kid: str) -> None:
+        return None
+
+
+async def test_cached_token_skips_verification_until_exp(clock, monkeypatch):
+    cache = VerifiedTokenCache(max_size=10)
+    token = "header.payload.signature"
+    cache.put(token, {"sub": "user-1", "exp": 1_060})
+    monkeypatch.setattr(cognito, "token_cache", cache)
+    # No key could verify the token, so only a cache hit lets it through.
+    monkeypatch.setattr(cognito, "jwks_store", NoKeys())
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    assert (await cognito.verify_token(credentials))["sub"] == "user-1"
+
+    clock.now = 1_060.0
+    with pytest.raises(HTTPException) as exc_info:
+        await cognito.verify_token(credentials)
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,178 @@
+"""Upload filenames and S3 cleanup when an upload fails, against a stubbed S3 client."""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from sqlalchemy import delete, insert
+
+from app.auth.cognito import verify_token
+from app.auth.permissions import permission_resolver
+from app.database import AsyncSessionLocal
+from app.main import app
+from app.models.tenant import Company, User
+from app.models.uploads import UPLOAD_PENDING, UPLOAD_QUEUED, Upload
+from app.routers.uploads import MAX_FILENAME_BYTES, _clean_filename
+from app.services import s3 as s3_service
+from app.services.ingest import UploadFormatError, ingest
+from app.services.s3 import MultipartWriter
+
+
+class StubS3:
+    """Stands in for the boto3 ``s3`` client, keeping objects in a dict."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, list[bytes]] = {}
+        self.calls: list[str] = []
+
+    def put_object(self, *, Bucket: str, Key: str, Body: bytes, **kwargs) -> dict:
+        self.calls.append("put_object")
+        self.objects[Key] = Body
+        return {}
+
+    def create_multipart_upload(self, *, Bucket: str, Key: str, **kwargs) -> dict:
+        self.calls.append("create_multipart_upload")
+        upload_id = str(uuid.uuid4())
+        self.uploads[upload_id] = []
+        return {"UploadId": upload_id}
+
+    def upload_part(self, *, UploadId: str, Body: bytes, **kwargs) -> dict:
+        self.calls.append("upload_part")
+        self.uploads[UploadId].append(Body)
+        return {"ETag": str(len(self.uploads[UploadId]))}
+
+    def complete_multipart_upload(self, *, Key: str, UploadId: str, **kwargs) -> dict:
+        self.calls.append("complete_multipart_upload")
+        self.objects[Key] = b"".join(self.uploads.pop(UploadId))
+        return {}
+
+    def abort_multipart_upload(self, *, UploadId: str, **kwargs) -> dict:
+        self.calls.append("abort_multipart_upload")
+        del self.uploads[UploadId]
+        return {}
+
+    def head_object(self, *, Bucket: str, Key: str) -> dict:
+        time.sleep(0.05)
+        return {"ContentLength": len(self.objects[Key]), "ETag": '"etag"'}
+
+    def delete_object(self, *, Bucket: str, Key: str) -> dict:
+        self.calls.append("delete_object")
+        self.objects.pop(Key, None)
+        return {}
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    stub = StubS3()
+    monkeypatch.setattr(s3_service.client, "_client", stub)
+    return stub
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("activity.csv", "activity.csv"),
+        ("  C:\\Users\\me\\activity.csv ", "activity.csv"),
+        ("../activity\x00\n.csv", "activity.csv"),
+        ("a" * 300 + ".csv", "a" * (MAX_FILENAME_BYTES - 4) + ".csv"),
+    ],
+)
+def test_clean_filename(filename, expected):
+    assert _clean_filename(filename) == expected
+
+
+def test_long_multibyte_filename_fits_in_bytes():
+    name = _clean_filename("é" * 200 + ".xlsx")
+    assert name.endswith(".xlsx")
+    assert len(name.encode()) <= MAX_FILENAME_BYTES
+
+
+async def test_abort_discards_parts_before_complete(s3):
+    writer = MultipartWriter("key", part_size=4)
+    await writer.write(b"123456")
+    await writer.abort()
+    assert s3.uploads == {}
+    assert "key" not in s3.objects
+
+
+@pytest.mark.parametrize("data", [b"small", b"spans several parts"])
+async def test_abort_deletes_a_completed_object(s3, data):
+    writer = MultipartWriter("key", part_size=8)
+    await writer.write(data)
+    await writer.complete()
+    assert s3.objects["key"] == data
+
+    await writer.abort()
+    assert "key" not in s3.objects
+
+
+async def test_empty_file_leaves_no_object(database, s3):
+    upload = Upload(id=uuid.uuid4(), s3_key="company/uploads/empty.csv", content_type=None)
+
+    async def chunks():
+        yield b""
+
+    async with AsyncSessionLocal() as db:
+        with pytest.raises(UploadFormatError):
+            await ingest(db, upload, "csv", chunks())
+
+    assert s3.calls == ["put_object", "delete_object"]
+    assert s3.objects == {}
+
+
+@pytest.fixture
+async def tenant_user(database, monkeypatch):
+    """A provisioned user, authenticated as the caller and granted every permission."""
+    company_id, user_id, sub = uuid.uuid4(), uuid.uuid4(), f"sub-{uuid.uuid4()}"
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(Company).values(id=company_id, name="Upload Test", slug=f"test-{company_id}")
+        )
+        await db.execute(
+            insert(User).values(
+                id=user_id, company_id=company_id, cognito_sub=sub, email="u@example.com"
+            )
+        )
+        await db.commit()
+    app.dependency_overrides[verify_token] = lambda: {"sub": sub}
+
+    async def allow(*args) -> bool:
+        return True
+
+    monkeypatch.setattr(permission_resolver, "has_permission", allow)
+    yield company_id, user_id
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Upload).where(Upload.company_id == company_id))
+        await db.execute(delete(User).where(User.company_id == company_id))
+        await db.execute(delete(Company).where(Company.id == company_id))
+        await db.commit()
+
+
+async def test_concurrent_completions_queue_once(api, s3, tenant_user):
+    company_id, user_id = tenant_user
+    upload_id = uuid.uuid4()
+    key = f"{company_id}/uploads/{upload_id}/invoice.pdf"
+    s3.objects[key] = b"%PDF"
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(Upload).values(
+                id=upload_id,
+                company_id=company_id,
+                uploaded_by=user_id,
+                filename="invoice.pdf",
+                s3_key=key,
+                status=UPLOAD_PENDING,
+            )
+        )
+        await db.commit()
+
+    responses = await asyncio.gather(
+        *(api.post(f"/uploads/{upload_id}/complete") for _ in range(4))
+    )
+
+    # Without the row lock every request would see the upload pending.
+    assert sorted(r.status_code for r in responses) == [200, 409, 409, 409]
+    async with AsyncSessionLocal() as db:
+        assert (await db.get(Upload, upload_id)).status == UPLOAD_QUEUED